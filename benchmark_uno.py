@@ -0,0 +1,277 @@
+"""
+Benchmarks for timing the uno engine, deck and rendering hot paths.
+
+Run this file to time every benchmark and write the results as JSON, so that
+runs can be compared across commits:
+
+    $ python benchmark_uno.py --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from uno_deck import Deck
+from uno_game import GameState
+from uno_controllers import BotPlayer
+from uno_simulation import setup_game, simulate_games
+from uno_renderers import StreamRenderer
+from uno_views import ColorTextView
+
+
+def time_calls(func, number, setup=None):
+    """
+    Time calling a function a number of times.
+
+    Args:
+        func: A function to time. If setup is given, it is called with the
+            value setup returns.
+        number: An int representing the number of calls to time.
+        setup: (optional) A function called before each call whose time isn't
+            counted (e.g. to refill a pile), or None (default).
+    Returns:
+        A dict with the number of calls, the total seconds they took, and the
+        microseconds per call.
+    """
+    seconds = 0
+    for _ in range(number):
+        if setup is None:
+            start = time.perf_counter()
+            func()
+        else:
+            value = setup()
+            start = time.perf_counter()
+            func(value)
+        seconds += time.perf_counter() - start
+    return {"calls": number, "seconds": seconds,
+            "us_per_call": seconds / number * 1e6}
+
+
+def benchmark_deck(number=1000):
+    """
+    Time building a full Deck and shuffling it.
+
+    Args:
+        number: (optional) An int representing the number of calls to time,
+            default is 1000.
+    Returns:
+        A dict with the timings of "construction" and "shuffle".
+    """
+    deck = Deck()
+    return {"construction": time_calls(Deck, number),
+            "shuffle": time_calls(deck.shuffle, number)}
+
+
+def benchmark_draw_and_add(deck_counts=(1, 4, 10), number=10000):
+    """
+    Time drawing a card from a Deck and adding it back to the top, at several
+    deck sizes.
+
+    Args:
+        deck_counts: (optional) A sequence of ints representing the numbers of
+            full decks to time, default is 1, 4 and 10.
+        number: (optional) An int representing the number of draws to time,
+            default is 10000.
+    Returns:
+        A dict with the timings for each deck size (in cards).
+    """
+    results = {}
+    for num_decks in deck_counts:
+        deck = Deck(num_decks=num_decks)
+
+        def draw_and_add(deck=deck):
+            deck.add_to_top(deck.draw()[0])
+
+        results[str(deck.size())] = time_calls(draw_and_add, number)
+    return results
+
+
+def benchmark_reuse_discard_pile(number=200):
+    """
+    Time reusing a full discard pile (all but 4 cards of a deck) as the draw
+    pile.
+
+    Args:
+        number: (optional) An int representing the number of reshuffles to
+            time, default is 200.
+    Returns:
+        A dict with the timing of GameState.reuse_discard_pile.
+    """
+    game = GameState(seed=0)
+
+    def fill_discard_pile():
+        for card in game.draw_pile.draw(game.draw_pile.size() - 4):
+            game.play_card(card)
+
+    return time_calls(lambda value: game.reuse_discard_pile(), number,
+                      fill_discard_pile)
+
+
+def benchmark_can_play(hand_sizes=(7, 30, 100), number=10000):
+    """
+    Time checking whether a player can play, over hands of several sizes.
+
+    Args:
+        hand_sizes: (optional) A sequence of ints representing the numbers of
+            cards in the hands to time, default is 7, 30 and 100.
+        number: (optional) An int representing the number of checks to time,
+            default is 10000.
+    Returns:
+        A dict with the timings for each hand size.
+    """
+    results = {}
+    for hand_size in hand_sizes:
+        game = GameState(seed=hand_size, num_decks=hand_size // 50 + 1)
+        player = BotPlayer(game, "Bot 0", play_card_delay=0)
+        player.hand = game.draw(hand_size)
+        results[str(hand_size)] = time_calls(player.can_play, number)
+    return results
+
+
+def benchmark_games(num_games=500, num_players=4, num_decks=1, seed=0):
+    """
+    Time headless bot games.
+
+    Args:
+        num_games: (optional) An int representing the number of games to play,
+            default is 500.
+        num_players: (optional) An int representing the number of BotPlayers
+            at the table, default is 4.
+        num_decks: (optional) An int representing the number of full decks in
+            the draw pile, default is 1.
+        seed: (optional) A seed for the games, default is 0.
+    Returns:
+        A dict with the number of games and turns played, the number of
+        seconds they took, the games and turns per second and the microseconds
+        per turn.
+    """
+    strategies = [BotPlayer] * num_players
+    start = time.perf_counter()
+    results = simulate_games(num_games, strategies, seed, num_decks=num_decks)
+    seconds = time.perf_counter() - start
+    turns = sum(result.turns for result in results)
+    return {"games": num_games, "turns": turns, "seconds": seconds,
+            "games_per_second": num_games / seconds,
+            "turns_per_second": turns / seconds,
+            "us_per_turn": seconds / turns * 1e6}
+
+
+def benchmark_large_table(num_games=200, num_players=20, num_decks=4,
+                          seed=0):
+    """
+    Time headless bot games at a large table with several decks.
+
+    Args:
+        num_games: (optional) An int representing the number of games to play,
+            default is 200.
+        num_players: (optional) An int representing the number of BotPlayers
+            at the table, default is 20.
+        num_decks: (optional) An int representing the number of full decks in
+            the draw pile, default is 4.
+        seed: (optional) A seed for the games, default is 0.
+    Returns:
+        A dict like benchmark_games() returns.
+    """
+    return benchmark_games(num_games, num_players, num_decks, seed)
+
+
+def benchmark_display(number=500):
+    """
+    Time ColorTextView drawing a whole turn (including a bot's hand) to a
+    null sink.
+
+    Args:
+        number: (optional) An int representing the number of frames to time,
+            default is 500.
+    Returns:
+        A dict with the timing of each frame and the frames per second.
+    """
+    director = setup_game([BotPlayer] * 4, GameState(seed=0))
+    with open(os.devnull, "w", encoding="utf-8") as null_sink:
+        view = ColorTextView(director.players, director.game,
+                             StreamRenderer(null_sink))
+        result = time_calls(
+            lambda: view.display(director.current_player(), True), number)
+    result["frames_per_second"] = number / result["seconds"]
+    return result
+
+
+def git_commit():
+    """
+    Return the hash of the git commit being benchmarked, or None if it can't
+    be found.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], check=True,
+                              capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scale=1.0):
+    """
+    Run every benchmark.
+
+    Args:
+        scale: (optional) A float to multiply the number of calls and games of
+            every benchmark by, default is 1 (e.g. 0.01 for a quick check).
+    Returns:
+        A dict with information about the run and the results of each
+        benchmark, which can be written as JSON.
+    """
+    def count(number):
+        return max(1, int(number * scale))
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scale": scale,
+        "benchmarks": {
+            "deck": benchmark_deck(count(1000)),
+            "draw_and_add": benchmark_draw_and_add(number=count(10000)),
+            "reuse_discard_pile": benchmark_reuse_discard_pile(count(200)),
+            "can_play": benchmark_can_play(number=count(10000)),
+            "games": benchmark_games(count(500)),
+            "large_table": benchmark_large_table(count(200)),
+            "display": benchmark_display(count(500)),
+        },
+    }
+
+
+def main(args=None):
+    """
+    Run the benchmarks and write their results as JSON.
+
+    Args:
+        args: (optional) A list of argument strings, or None (default) to use
+            sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Time the uno engine.")
+    parser.add_argument("--output", default="-",
+                        help="file to write the JSON results to (default: "
+                        "standard output)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply the size of every benchmark by this")
+    options = parser.parse_args(args)
+
+    results = run_benchmarks(options.scale)
+    text = json.dumps(results, indent=2)
+    if options.output == "-":
+        print(text)
+    else:
+        with open(options.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+        games = results["benchmarks"]["games"]
+        sys.stderr.write(f"Wrote {options.output} "
+                         f"({games['games_per_second']:.0f} games/s)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,30 @@
 Main method for playing the uno game.
 """
 
+import argparse
 import textwrap
+from contextlib import ExitStack
 from uno_game import GameState, GameDirector
 from uno_controllers import UserPlayerTextController, BotPlayer
-from uno_views import ColorTextView
+from uno_views import ColorTextView, ConsoleEventObserver, EventLog
+from uno_pacing import TurnPacer
+from uno_renderers import DiffRenderer
+from uno_profiling import TurnProfiler, ChromeTracer
 
 
-def main():
+def main(full_screen=False, profile_turns=False, trace=None):
     """
     Have the user play an UNO game against 3 computer opponents.
+
+    Args:
+        full_screen: (optional) A bool that is True to redraw the game in
+            place at the top of the terminal, only rewriting the rows that
+            change, or False (default) to print each turn below the last.
+        profile_turns: (optional) A bool that is True to time each phase of
+            the turns and print a table of the timings when the game ends, or
+            False (default) to play without timing anything.
+        trace: (optional) A string representing a file to write a Chrome
+            trace of every turn to when the game ends, or None (default).
     """
     # Print the welcome message
     with open("welcome_message.txt", "r") as file:
@@ -32,26 +47,102 @@ def main():
     bot3 = BotPlayer(game, "Bot 3")
     player_list = [user_player, bot1, bot2, bot3]
 
-    # Initialize the viewer
-    view = ColorTextView(player_list, game)
+    # Initialize the viewer, and show what each player does during their turn:
+    # inside the frame in full-screen mode (since anything printed below it is
+    # cleared by the next frame), or else printed below the frame
+    if full_screen:
+        event_log = EventLog()
+        game.events.subscribe(event_log)
+        view = ColorTextView(player_list, game, DiffRenderer(), event_log)
+    else:
+        event_log = None
+        game.events.subscribe(ConsoleEventObserver())
+        view = ColorTextView(player_list, game)
+    # Hold each turn back until the last bot's play_card_delay has passed
+    pacer = TurnPacer(game)
 
     # Intialize the GameDirector (handles reverses, determines who goes next)
     director = GameDirector(player_list, game)
 
+    # Time the phases of each turn if asked to
+    profilers = []
+    if profile_turns:
+        profilers.append(TurnProfiler())
+    if trace is not None:
+        profilers.append(ChromeTracer())
+    for profiler in profilers:
+        profiler.instrument_view(view)
+        profiler.instrument_director(director)
+        profiler.instrument_pacer(pacer)
+
     # Continue the game turn cycle until a player wins
     while game.won is False:
-        # Display the game information (current card, the other players and how
-        # many cards they have, and the user's hand if it's their turn)
-        view.display(director.current_player())
-        # Have the current player handle any card actions (skip, +2, +4), play
-        # a card, or draw a card from the draw pile if they can't play anything
-        director.call_the_player()
-        # Check if a reverse was played, and if it was, then reverse the
-        # direction attribute of game
-        director.handle_reverse()
-        # Use the game.direction and the player list to move to the next player
-        director.go_to_next_player()
+        with ExitStack() as turn_spans:
+            # Time the whole turn, with the phases of play_turn() nested in it
+            for profiler in profilers:
+                turn_spans.enter_context(profiler.span("turn"))
+            play_turn(director, view, pacer)
+
+    # Show how the game ended, since no frame is drawn after the last turn
+    if event_log is not None:
+        print("\n".join(event_log.lines))
+
+    if profile_turns:
+        print(profilers[0].report())
+    if trace is not None:
+        profilers[-1].write(trace)
+
+
+def play_turn(director, view, pacer):
+    """
+    Play one turn of the game cycle: display the game, have the current player
+    take their turn, and move on to the next player.
+
+    Args:
+        director: The GameDirector of the game.
+        view: The UnoView displaying the game.
+        pacer: The TurnPacer holding the turns back.
+    """
+    player = director.current_player()
+    # Wait out the delay of the player who last played a card
+    pacer.wait()
+    # Display the game information (current card, the other players and how
+    # many cards they have, and the user's hand if it's their turn)
+    view.display(player)
+    # Have the current player handle any card actions (skip, +2, +4), play
+    # a card, or draw a card from the draw pile if they can't play anything
+    director.call_the_player()
+    # Check if a reverse was played, and if it was, then reverse the
+    # direction attribute of game
+    director.handle_reverse()
+    # Use the game.direction and the player list to move to the next player
+    director.go_to_next_player()
+    # The user's prompts, answers and error messages are written below the
+    # frame and may have scrolled the terminal, so redraw the next frame in
+    # full
+    if player.player_type == "User":
+        view.renderer.invalidate()
+
+
+def parse_args(args=None):
+    """
+    Parse the command line arguments for playing the game.
+
+    Args:
+        args: (optional) A list of argument strings, or None (default) to use
+            sys.argv.
+    Returns:
+        An argparse.Namespace.
+    """
+    parser = argparse.ArgumentParser(description="Play UNO against 3 bots.")
+    parser.add_argument("--full-screen", action="store_true",
+                        help="redraw the game in place instead of scrolling")
+    parser.add_argument("--profile-turns", action="store_true",
+                        help="print how long each phase of the turns took")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write a Chrome trace of every turn to PATH")
+    return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    main(**vars(parse_args()))
@@ -2,7 +2,13 @@
 Test all aspects of the uno game, across all files and classes, using pytest.
 """
 
+import io
+import json
+import os
+import time
 import pytest
+import benchmark_uno
+from play_uno import play_turn
 from testing_decks import (
     normal_test_deck1,
     normal_test_deck2,
@@ -17,9 +23,62 @@ from testing_helpers import (
     unpack_deck,
     pack_deck
 )
-from uno_deck import Card, Deck
+from uno_deck import (
+    Card,
+    Deck,
+    Hand,
+    CARD_TYPES,
+    COLORS,
+    DECK_LAYOUT,
+    PLAYABLE_MASKS,
+    SHARED_CARDS
+)
 from uno_game import GameState, GameDirector
 from uno_controllers import BotPlayer, UserPlayerTextController
+from uno_events import (
+    CardPlayed,
+    CardsDrawn,
+    PlayerSkipped,
+    ColorChosen,
+    GameWon
+)
+from uno_views import ColorTextView, ConsoleEventObserver, EventLog
+from uno_pacing import TurnPacer
+from uno_profiling import TurnProfiler, PhaseHistogram, ChromeTracer
+from uno_metrics import MetricsCollector, MetricsExporter
+from uno_renderers import (
+    DiffRenderer,
+    move_cursor,
+    CLEAR_SCREEN,
+    CLEAR_LINE_END,
+    CLEAR_SCREEN_END,
+    display_width
+)
+from uno_color_text_view_helpers import (
+    load_big_card,
+    get_big_card,
+    put_in_card,
+    color_card_rep,
+    small_card_sprite,
+    big_card_sprite,
+    ring_layout
+)
+from uno_search_bots import (
+    MCTSBotPlayer,
+    ParallelMCTSBotPlayer,
+    determinize
+)
+from uno_simulation import (
+    setup_game,
+    run_game,
+    simulate_game,
+    simulate_games,
+    run_tournament,
+    tally_wins,
+    trace_memory,
+    decks_needed,
+    main as simulation_main
+)
 
 
 def test_deck_packing():
@@ -77,7 +136,8 @@ uno_chosen_color_cases = [
 @pytest.mark.parametrize("color,symbol,chosen_color", uno_chosen_color_cases)
 def test_uno_card_chosen_color(color, symbol, chosen_color):
     """
-    Test setting a wild card's chosen color attribute.
+    Test choosing a wild card's color, which gives a colored copy and leaves
+    the card itself unchanged.
 
     Args:
         color: A string representing the test card's color.
@@ -89,15 +149,15 @@ def test_uno_card_chosen_color(color, symbol, chosen_color):
     assert card.color == color
     assert card.symbol == symbol
 
-    card.set_chosen_color(chosen_color)
-
-    assert card.color == chosen_color
-    assert card.symbol == symbol
+    colored_card = card.with_chosen_color(chosen_color)
 
-    card.strip_chosen_color()
+    assert colored_card.color == chosen_color
+    assert colored_card.symbol == symbol
+    assert colored_card.type_id == card.type_id
 
     assert card.color == color
     assert card.symbol == symbol
+    assert card.chosen_color == ""
 
 
 def test_full_deck_creation():
@@ -145,6 +205,40 @@ def test_full_deck_creation():
     assert len(deck.cards) == 112
 
 
+def test_card_type_table():
+    """
+    Check that the card type table has the 54 distinct cards with the right
+    flags, and that decks share their cards.
+    """
+    assert len(CARD_TYPES) == 54
+    assert len({(card_type.color, card_type.symbol)
+                for card_type in CARD_TYPES}) == 54
+    assert sum(card_type.wild for card_type in CARD_TYPES) == 2
+    assert sum(card_type.action for card_type in CARD_TYPES) == 13
+    assert sum(card_type.special for card_type in CARD_TYPES) == 14
+
+    deck = Deck()
+    deck2 = Deck()
+    for card, card2 in zip(deck.cards, deck2.cards):
+        assert CARD_TYPES[card.type_id].symbol == card.symbol
+        assert card is card2
+
+
+def test_playable_masks():
+    """
+    Check that the playable masks agree with the color/symbol/Wild matching
+    rules for every current card type and color.
+    """
+    assert len(PLAYABLE_MASKS) == 54
+    for current in CARD_TYPES:
+        for color_index, color in enumerate(COLORS):
+            mask = PLAYABLE_MASKS[current.type_id][color_index]
+            for card_type in CARD_TYPES:
+                playable = (card_type.wild or card_type.color == color or
+                            card_type.symbol == current.symbol)
+                assert bool(mask & card_type.bit) == playable
+
+
 def test_shuffle():
     """
     Test that shuffling the deck changes the order of the cards.
@@ -156,6 +250,25 @@ def test_shuffle():
     assert unpack_deck(deck) != unpack_deck(deck2)
 
 
+def test_deck_stack_order():
+    """
+    Check that drawing from and adding to the top and bottom of a deck keep
+    the cards in order from the top of the deck to the bottom.
+    """
+    deck = pack_deck(normal_test_deck1[:6])
+    deck.add_to_top(Card("Blue", "9"))
+    deck.add_to_bottom(pack_cards([["Red", "1"], ["Red", "2"]]))
+
+    assert unpack_cards([deck.show_top()]) == [["Blue", "9"]]
+    assert unpack_cards(deck.draw(3)) == [["Blue", "9"]] + \
+        normal_test_deck1[:2]
+    assert deck.draw(0) == []
+    remaining = normal_test_deck1[2:6] + [["Red", "1"], ["Red", "2"]]
+    assert unpack_deck(deck) == remaining
+    assert unpack_cards(deck.draw(10)) == remaining
+    assert deck.size() == 0
+
+
 draw_cards_cases = [
     (normal_test_deck1, 1, [["Green", "2"]]),
     (normal_test_deck2, 2, [["Red", "3"], ["Green", "9"]]),
@@ -374,6 +487,64 @@ def test_play_card(current_card, played_card, result):
     assert player.play_card(played_card) == result
 
 
+hand_playable_cases = [
+    (Card("Red", "5"), [["Blue", "5"], ["Red", "Skip"], ["Green", "1"]],
+     [["Red", "Skip"], ["Blue", "5"]], ["Blue", "5"]),
+    (Card("Green", "+2"), [["Red", "2"], ["Wild", "+4"], ["Blue", "+2"]],
+     [["Blue", "+2"], ["Wild", "+4"]], ["Wild", "+4"]),
+    (Card("Yellow", "0"), [["Red", "1"], ["Blue", "Reverse"]], [], None),
+    (Card("Wild", ""), [["Red", "1"], ["Wild", ""]], [["Wild", ""]],
+     ["Wild", ""]),
+]
+
+
+@pytest.mark.parametrize("current_card,hand_list,playable,first",
+                         hand_playable_cases)
+def test_hand_playable_cards(current_card, hand_list, playable, first):
+    """
+    Check that a Hand finds the cards that can be played on the current card.
+
+    Args:
+        current_card: A Card instance representing the card on the top of the
+            discard pile / the current card.
+        hand_list: A list of cards represented by lists of strings to be
+            packed into the hand.
+        playable: A list of the cards represented by lists of strings that
+            can be played, in the order playable_cards() returns them.
+        first: The first playable card in the hand represented as a list of
+            strings, or None if no card can be played.
+    """
+    hand = Hand(pack_cards(hand_list))
+
+    assert hand.can_play(current_card) == (first is not None)
+    assert unpack_cards(hand.playable_cards(current_card)) == playable
+    first_card = hand.first_playable(current_card)
+    if first is None:
+        assert first_card is None
+    else:
+        assert unpack_cards([first_card]) == [first]
+
+
+def test_hand_insert_and_remove():
+    """
+    Check that inserting and removing cards keep the hand and its buckets in
+    hand order.
+    """
+    hand = Hand(pack_cards([["Red", "1"], ["Blue", "2"]]))
+    red_skip = Card("Red", "Skip")
+    hand.insert(1, red_skip)
+    hand.insert(0, Card("Green", "1"))
+
+    assert unpack_cards(hand) == [["Green", "1"], ["Red", "1"],
+                                  ["Red", "Skip"], ["Blue", "2"]]
+    assert unpack_cards(hand.playable_cards(Card("Red", "9"))) == [
+        ["Red", "1"], ["Red", "Skip"]]
+
+    hand.remove(red_skip)
+    assert len(hand) == 3
+    assert not hand.can_play(Card("Yellow", "Skip"))
+
+
 def test_playing_draw2():
     """
     Check that playing a "+2" card makes the next player draw 2 cards.
@@ -603,6 +774,242 @@ def test_win_condition(card):
     assert game.won is True
 
 
+def test_turn_events(capsys):
+    """
+    Check that a turn publishes its events to every observer, in order, and
+    that the console observer prints them.
+    """
+    game = GameState(seed=1)
+    game.discard_pile = Deck(def_cards=[Card("Red", "0")])
+    bot0 = BotPlayer(game, "Bot 0", play_card_delay=0)
+    bot1 = BotPlayer(game, "Bot 1", play_card_delay=0)
+    director = GameDirector([bot0, bot1], game)
+    bot0.hand = [Card("Wild", "+4")]
+    wild = bot0.hand[0]
+    bot1.hand = [Card("Blue", "1")]
+
+    events = []
+    game.events.subscribe(events.append)
+    game.events.subscribe(ConsoleEventObserver())
+    director.call_the_player()
+    director.go_to_next_player()
+    director.call_the_player()
+
+    color = game.current_color()
+    assert events == [CardPlayed(bot0, wild), ColorChosen(bot0, color),
+                      GameWon(bot0), CardsDrawn(bot1, 4, "+4")]
+    assert capsys.readouterr().out == (
+        f"Bot 0 played Wild +4.\nBot 0 chose {color}.\nBot 0 won!\n"
+        "Bot 1 drew 4 cards and misses their turn.\n")
+
+    # Without observers, nothing is published
+    game.events.observers.clear()
+    bot1.take_turn()
+    assert len(events) == 4
+
+
+def test_turn_pacer():
+    """
+    Check that bots don't block while playing, and that the pacer holds the
+    next turn back until the delay of the last card played has passed.
+    """
+    now = [100.0]
+    game = GameState(seed=2)
+    game.discard_pile = Deck(def_cards=[Card("Red", "0")])
+    pacer = TurnPacer(game, clock=lambda: now[0])
+    bot = BotPlayer(game, "Bot 0", play_card_delay=5)
+    bot.hand = [Card("Red", "1"), Card("Red", "2")]
+
+    start = time.monotonic()
+    bot.take_turn()
+    assert time.monotonic() - start < 1
+    assert pacer.remaining() == 5
+
+    now[0] += 3
+    assert pacer.remaining() == 2
+    now[0] += 2
+    assert pacer.remaining() == 0
+    assert pacer.deadline is None
+
+
+def test_big_card_cache():
+    """
+    Check that the big card art is only read once per symbol, and that coloring
+    a returned card doesn't change the cached art.
+    """
+    load_big_card.cache_clear()
+    plain = get_big_card("Skip")
+    color_card_rep(get_big_card("Skip"), "Red")
+    assert get_big_card("Skip") == plain
+    assert get_big_card("Skip") is not get_big_card("Skip")
+    assert load_big_card.cache_info().misses == 1
+
+
+def test_card_sprites():
+    """
+    Check that the sprite atlas matches coloring the art directly, and hands
+    out the same rows every time.
+    """
+    for symbol, color in [("5", "Red"), ("", "Wild"), ("+4", "Wild")]:
+        sprite = small_card_sprite(symbol, color)
+        assert list(sprite) == color_card_rep(put_in_card(symbol), color)
+        assert small_card_sprite(symbol, color) is sprite
+    sprite = big_card_sprite("Reverse", "Blue")
+    assert list(sprite) == color_card_rep(get_big_card("Reverse"), "Blue")
+    assert big_card_sprite("Reverse", "Blue") is sprite
+
+
+def test_view_single_write(monkeypatch):
+    """
+    Check that displaying a turn writes the whole frame to the terminal at
+    once.
+    """
+    writes = []
+
+    class RecordingStdout:
+        """
+        A stand-in for sys.stdout that records each write.
+        """
+        def write(self, text):
+            writes.append(text)
+
+        def flush(self):
+            pass
+
+    game = GameState(seed=3)
+    players = [BotPlayer(game, f"Bot {i}", play_card_delay=0)
+               for i in range(4)]
+    view = ColorTextView(players, game)
+    monkeypatch.setattr("sys.stdout", RecordingStdout())
+    view.display(players[0], show_bot_hands=True)
+
+    assert len(writes) == 1
+    assert writes[0].endswith("\n".join(view.hand_rows(players[0])) + "\n")
+
+
+def test_diff_renderer():
+    """
+    Check that the differential renderer only rewrites the rows that changed,
+    and clears the screen below the frame.
+    """
+    stream = io.StringIO()
+    renderer = DiffRenderer(stream, lambda: os.terminal_size((80, 24)))
+    first = renderer.render(["top", "Bot 1 (5)", "hand"])
+    assert first.startswith(CLEAR_SCREEN)
+    assert "top" in first and "hand" in first
+
+    second = renderer.render(["top", "Bot 1 (4)"])
+    assert second == (move_cursor(1) + "Bot 1 (4)" + CLEAR_LINE_END +
+                      move_cursor(2) + CLEAR_SCREEN_END)
+    assert stream.getvalue() == first + second
+
+    renderer.invalidate()
+    assert renderer.render(["top"]).startswith(CLEAR_SCREEN)
+
+    # Frames that don't fit on the screen are drawn in full, and so is the
+    # next frame
+    renderer.terminal_size = lambda: os.terminal_size((10, 3))
+    for rows in (["top", "x" * 11], ["1", "2", "3"]):
+        assert renderer.render(rows) == \
+            CLEAR_SCREEN + move_cursor(0) + "\n".join(rows) + "\n"
+    assert renderer.render(["top"]).startswith(CLEAR_SCREEN)
+    assert renderer.render(["top"]) == move_cursor(1) + CLEAR_SCREEN_END
+
+
+def test_full_screen_user_turn(monkeypatch, capsys):
+    """
+    Check that a frame leaving no room below it for the input prompt and the
+    user's answer is drawn in full, and that the frame after the user's turn
+    is too, since the input may have scrolled the terminal.
+    """
+    game = GameState(seed=5)
+    user = UserPlayerTextController(game, "User")
+    players = [user] + [BotPlayer(game, f"Bot {i}", play_card_delay=0)
+                        for i in range(1, 4)]
+    director = GameDirector(players, game)
+    renderer = DiffRenderer(io.StringIO())
+    view = ColorTextView(players, game, renderer, EventLog())
+    rows = view.frame_rows(user)
+    renderer.terminal_size = lambda: os.terminal_size((80, len(rows) + 2))
+    assert renderer.fits(rows)
+    renderer.terminal_size = lambda: os.terminal_size((80, len(rows) + 1))
+    assert not renderer.fits(rows)
+
+    answers = iter(["x"] + [str(index) for index in range(1, 30)])
+    monkeypatch.setattr("builtins.input", lambda prompt="": (
+        "r" if "color" in prompt else next(answers)))
+    play_turn(director, view, TurnPacer())
+    assert "Invalid input" in capsys.readouterr().out
+    assert renderer.last_rows is None
+    assert renderer.render(view.frame_rows(director.current_player())) \
+        .startswith(CLEAR_SCREEN)
+
+
+def test_full_screen_frame():
+    """
+    Check that the hand is split over rows that fit the terminal, and that
+    the latest event messages are drawn inside the frame.
+    """
+    game = GameState(seed=3)
+    players = [BotPlayer(game, f"Bot {i}", play_card_delay=0)
+               for i in range(4)]
+    players[0].draw(13)
+    renderer = DiffRenderer(io.StringIO(), lambda: os.terminal_size((80, 40)))
+    event_log = EventLog()
+    game.events.subscribe(event_log)
+    view = ColorTextView(players, game, renderer, event_log)
+
+    rows = view.hand_rows(players[0])
+    assert len(rows) == 1 + 2 * 5
+    assert max(display_width(row) for row in rows) <= 80
+    assert rows[5].split() == [str(i) for i in range(1, 14)]
+    assert rows[-1].split() == [str(i) for i in range(14, 21)]
+
+    players[1].publish(PlayerSkipped)
+    players[2].publish(CardsDrawn, 4, "+4")
+    rows = view.frame_rows(players[3])
+    turn_row = rows.index("It's Bot 3's turn.")
+    assert rows[turn_row - 3:turn_row] == [
+        "Bot 1 was skipped.", "Bot 2 drew 4 cards and misses their turn.", ""]
+    assert renderer.fits(rows)
+
+
+@pytest.mark.parametrize("num_players", range(2, 11))
+def test_player_ring(num_players):
+    """
+    Check that the view's player ring shows every player's name and card count
+    for 2 to 10 players, and that 4 players make the usual diamond.
+
+    Args:
+        num_players: An int representing the number of players at the table.
+    """
+    game = GameState(seed=4)
+    players = [BotPlayer(game, f"Bot {i}", play_card_delay=0)
+               for i in range(num_players)]
+    players[1].draw(3)
+    view = ColorTextView(players, game)
+    ring = view.make_other_players_ring()
+    text = "\n".join(ring)
+    for player in players:
+        assert player.name in text
+    assert text.count("(7)") == num_players - 1
+    assert "(10)" in text
+    assert ring_layout(tuple(player.name for player in players)) is \
+        ring_layout(tuple(player.name for player in players))
+
+    rows = view.other_players_and_current_card_rows()
+    assert len(rows) == max(11, len(ring)) + 1
+    if num_players == 4:
+        assert ring == ["      Bot 2      ",
+                        "       (7)       ",
+                        "   \u2197        \u2198    ",
+                        "Bot 1       Bot 3",
+                        " (10)        (7) ",
+                        "   \u2196        \u2199    ",
+                        "      Bot 0      ",
+                        "       (7)       "]
+
+
 def test_reuse_discard_pile():
     """
     Test the GameState.reuse_discard_pile() function.
@@ -622,3 +1029,483 @@ def test_reuse_discard_pile():
     # Check sizes of the new draw and discard piles
     assert game.draw_pile.size() == orig_draw_size + orig_discard_size - 1
     assert game.discard_pile.size() == 1
+
+
+def test_small_draw_pile():
+    """
+    Check that a game can be set up with a draw pile too small to reshuffle,
+    before there is a discard pile to reuse.
+    """
+    game = GameState(def_deck=pack_deck([["Red", "1"], ["Blue", "2"],
+                                         ["Green", "3"]]))
+    assert unpack_cards([game.current_card()]) == [["Red", "1"]]
+    assert game.draw_pile.size() == 2
+    assert game.reshuffles == 0
+
+
+def test_reuse_discard_pile_in_place():
+    """
+    Check that reusing the discard pile keeps both piles and the order of the
+    cards, and that Wild cards played with a chosen color are plain Wild cards
+    again once they are drawn, without the shared cards changing.
+    """
+    game = GameState(seed=2)
+    wild = Card("Wild", "")
+    red_wild = wild.with_chosen_color("Red")
+    assert red_wild is wild.with_chosen_color("Red")
+    assert wild.color == "Wild" and red_wild.color == "Red"
+
+    for card in game.draw_pile.draw(game.draw_pile.size() - 2):
+        game.play_card(card)
+    game.play_card(red_wild)
+    game.play_card(Card("Blue", "3"))
+    draw_pile, discard_pile = game.draw_pile, game.discard_pile
+    # The discard pile without its top card, from the bottom up like the
+    # cards are shuffled
+    reused = discard_pile.cards[:0:-1]
+    kept = draw_pile.cards
+
+    game.rng.seed(0)
+    game.reuse_discard_pile()
+    game.rng.seed(0)
+    game.rng.shuffle(reused)
+    expected = kept + reused[::-1]
+
+    assert game.draw_pile is draw_pile and game.discard_pile is discard_pile
+    assert [repr(card) for card in game.draw_pile.cards] == \
+        [repr(card) for card in expected]
+    assert game.current_card().symbol == "3"
+
+    hand = Hand(game.draw_pile.draw(game.draw_pile.size()))
+    assert all(card.chosen_color == "" for card in hand)
+    assert all(card.chosen_color == "" for card in SHARED_CARDS)
+    hand.remove(red_wild)
+    assert len(hand) == len(expected) - 1
+
+
+def test_simulate_games(capsys):
+    """
+    Check that headless simulations finish every game with a winner who has no
+    cards left, without printing anything.
+    """
+    results = simulate_games(20, seed=1)
+
+    assert len(results) == 20
+    for result in results:
+        assert result.winner in range(4)
+        assert result.winner_name == f"Bot {result.winner}"
+        assert result.turns > 0
+        assert result.reshuffles >= 0
+    assert capsys.readouterr().out == ""
+
+
+def test_simulate_games_seeded():
+    """
+    Check that simulations with the same seed play out the same way.
+    """
+    assert simulate_games(10, seed=5) == simulate_games(10, seed=5)
+
+
+def test_replay_game_from_seed():
+    """
+    Check that a single game from a batch can be replayed from its seed, even
+    when other games are played in between.
+    """
+    results = simulate_games(5, seed=8)
+    simulate_games(3)
+    assert simulate_game(seed=results[3].seed) == results[3]
+
+    first = GameState(seed=12)
+    second = GameState(seed=12)
+    assert unpack_deck(first.draw_pile) == unpack_deck(second.draw_pile)
+
+
+def unpack_table(director):
+    """
+    Return a list-based representation of a table's game and hands, for
+    comparing tables. Only the symbols of the discard pile are included, since
+    the colors chosen for Wild cards under the current card don't matter.
+
+    Args:
+        director: A GameDirector instance.
+    """
+    game = director.game
+    return [unpack_deck(game.draw_pile),
+            [card.symbol for card in game.discard_pile.cards],
+            game.current_color(), game.direction, game.current_action,
+            game.won, [unpack_cards(player.hand)
+                       for player in director.players],
+            director.current_player_index]
+
+
+def test_snapshot_and_restore():
+    """
+    Check that restoring a table snapshot undoes the turns played after it,
+    and that a snapshot can be restored onto another table.
+    """
+    director = setup_game([BotPlayer] * 4, GameState(seed=2))
+    for _ in range(15):
+        director.call_the_player()
+        director.handle_reverse()
+        director.go_to_next_player()
+    snapshot = director.snapshot()
+    before = unpack_table(director)
+
+    for _ in range(15):
+        director.call_the_player()
+        director.handle_reverse()
+        director.go_to_next_player()
+    assert unpack_table(director) != before
+
+    director.restore(snapshot)
+    assert unpack_table(director) == before
+    assert director.turns == 15
+    assert (director.game.cards_drawn, director.game.actions_resolved) == \
+        (snapshot.game.cards_drawn, snapshot.game.actions_resolved)
+
+    other = setup_game([BotPlayer] * 4)
+    other.restore(snapshot)
+    assert unpack_table(other) == before
+
+
+def test_run_tournament():
+    """
+    Check that a tournament gives the same results no matter how many worker
+    processes play it.
+    """
+    in_process = run_tournament(30, seed=3, workers=1, chunk_size=7)
+    pooled = run_tournament(30, seed=3, workers=2, chunk_size=7)
+
+    assert len(in_process) == 30
+    assert in_process == pooled
+    assert sum(tally_wins(pooled, 4)) == 30
+
+
+def test_large_table():
+    """
+    Check that a game can seat 20 players with 4 decks, that seating wraps
+    around the table in both directions, and that no cards are lost.
+    """
+    assert decks_needed(15) == 1 and decks_needed(16) == 2
+    with pytest.raises(ValueError):
+        simulate_game([BotPlayer] * 20, seed=5)
+    with pytest.raises(SystemExit):
+        simulation_main(["--games", "1", "--players", "20", "--decks", "1"])
+
+    game = GameState(seed=5, num_decks=4)
+    director = setup_game([BotPlayer] * 20, game)
+    assert game.draw_pile.size() + game.discard_pile.size() == 448 - 140
+
+    director.go_to_next_player()
+    assert director.current_player_index == 1
+    game.reverse_direction()
+    director.go_to_next_player()
+    director.go_to_next_player()
+    assert director.current_player() is director.players[19]
+    game.reverse_direction()
+
+    run_game(director)
+    assert game.won
+    assert (game.draw_pile.size() + game.discard_pile.size() +
+            sum(player.num_cards() for player in director.players)) == 448
+
+
+def test_turn_profiler():
+    """
+    Check that the profiler times every phase of the turns it instruments,
+    and that removing it puts the original methods back.
+    """
+    ticks = iter(range(0, 10**9, 100))
+    profiler = TurnProfiler(clock=lambda: next(ticks))
+    director = setup_game([BotPlayer] * 4, GameState(seed=6))
+    profiler.instrument_director(director)
+    turns = run_game(director)
+
+    histograms = profiler.histograms
+    assert histograms["call_the_player"].count == turns
+    assert histograms["handle_action"].count == turns
+    assert histograms["go_to_next_player"].count == turns - 1
+    assert set(histograms) <= {"call_the_player", "handle_reverse",
+                               "go_to_next_player", "handle_action",
+                               "can_play", "choose_card", "draw"}
+    assert histograms["handle_reverse"].min_ns == 100
+
+    with profiler.span("turn"):
+        pass
+    assert histograms["turn"].count == 1 and histograms["turn"].min_ns == 100
+    assert "choose_card" in profiler.report()
+
+    profiler.remove()
+    assert "handle_action" not in vars(director.players[0])
+    assert "call_the_player" not in vars(director)
+
+    histogram = PhaseHistogram()
+    for duration in (10, 20, 30, 1000):
+        histogram.record(duration)
+    assert histogram.mean_ns() == 265
+    assert histogram.percentile_ns(50) == 31
+    assert histogram.percentile_ns(100) == 1000
+
+
+def test_profile_and_memory_modes(tmp_path, capsys):
+    """
+    Check that the batch runner's cProfile mode writes collapsed stacks, and
+    that its tracemalloc mode plays the same games as simulate_games() and
+    reports every few games.
+    """
+    path = str(tmp_path / "stacks.txt")
+    simulation_main(["--games", "3", "--seed", "9", "--profile", path])
+    with open(path, encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    assert lines
+    for line in lines:
+        stack, microseconds = line.rsplit(" ", 1)
+        assert stack and int(microseconds) >= 0
+    assert any("take_turn (uno_controllers.py" in line for line in lines)
+    assert "3 games" in capsys.readouterr().out
+
+    results, reports = trace_memory(5, 2, top=3, seed=9)
+    assert results == simulate_games(5, seed=9)
+    assert [report[0] for report in reports] == [2, 4, 5]
+    assert all(len(report[2]) <= 3 for report in reports)
+
+    # Counts below 1 are rejected instead of crashing the run
+    for option in ("--games", "--memory", "--top"):
+        with pytest.raises(SystemExit):
+            simulation_main([option, "0"])
+    assert "must be at least 1" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("first_removed", [0, 1])
+def test_stacked_profilers(first_removed):
+    """
+    Check that two profilers can instrument the same methods, and that
+    removing either one first leaves the other one recording.
+
+    Args:
+        first_removed: An int representing the index of the profiler to remove
+            first.
+    """
+    profilers = [TurnProfiler(), ChromeTracer()]
+    director = setup_game([BotPlayer] * 4, GameState(seed=6))
+    for profiler in profilers:
+        profiler.instrument_director(director)
+    def calls(profiler):
+        """
+        Return the number of call_the_player calls a profiler recorded.
+        """
+        if isinstance(profiler, ChromeTracer):
+            return len([event for event in profiler.events
+                        if event["name"] == "call_the_player"])
+        return profiler.histograms["call_the_player"].count
+
+    run_game(director, max_turns=5)
+    assert [calls(profiler) for profiler in profilers] == [5, 5]
+
+    profilers[first_removed].remove()
+    run_game(director, max_turns=5)
+    counts = [10, 10]
+    counts[first_removed] = 5
+    assert [calls(profiler) for profiler in profilers] == counts
+
+    kept = profilers[1 - first_removed]
+
+    kept.remove()
+    assert "call_the_player" not in vars(director)
+    assert "draw" not in vars(director.players[0])
+
+
+def test_chrome_tracer(tmp_path):
+    """
+    Check that the tracer records a span for every turn of a batch of games,
+    with the players' phases nested inside the turns, and writes a trace that
+    can be loaded as JSON.
+    """
+    tracer = ChromeTracer(pid=1)
+    results = simulate_games(2, seed=8, profiler=tracer)
+    path = str(tmp_path / "trace.json")
+    tracer.write(path)
+    with open(path, encoding="utf-8") as file:
+        events = json.load(file)["traceEvents"]
+
+    turns = [event for event in events if event["name"] == "turn"]
+    assert len(turns) == sum(result.turns for result in results)
+    assert all(event["ph"] == "X" and event["pid"] == 1 for event in events)
+    for event in events:
+        if event["name"] in ("call_the_player", "handle_action",
+                             "choose_card", "go_to_next_player"):
+            assert any(turn["ts"] <= event["ts"] and
+                       event["ts"] + event["dur"] <=
+                       turn["ts"] + turn["dur"] + 1e-3
+                       for turn in turns)
+
+
+def test_metrics_export(tmp_path):
+    """
+    Check that the game counters add up across a run of games, and that the
+    exporter writes them in both formats once per interval.
+    """
+    now = [0.0]
+    prometheus_path = str(tmp_path / "uno.prom")
+    jsonl_path = str(tmp_path / "uno.jsonl")
+    prometheus = MetricsExporter(prometheus_path, interval=5,
+                                 clock=lambda: now[0])
+    collector = MetricsCollector(prometheus)
+    now[0] = 2.0
+    results = simulate_games(3, seed=7, metrics=collector)
+
+    assert collector.games == 3
+    assert collector.turns == sum(result.turns for result in results)
+    assert collector.reshuffles == sum(result.reshuffles
+                                       for result in results)
+    assert collector.cards_drawn >= 3 * (28 + 1)
+    assert collector.actions_resolved > 0
+    assert collector.longest_game == max(result.turns for result in results)
+
+    # The games ended before the interval passed, so they were only written
+    # when the collector was flushed at the end
+    with open(prometheus_path, encoding="utf-8") as file:
+        text = file.read()
+    assert f"uno_turns_total {collector.turns}\n" in text
+    assert f"uno_turns_per_second {collector.turns / 2}\n" in text
+    assert not prometheus.flush(collector)
+    assert not prometheus.maybe_export(collector)
+
+    now[0] = 10.0
+    assert prometheus.maybe_export(collector)
+
+    json_lines = MetricsExporter(jsonl_path, "jsonl", clock=lambda: now[0])
+    json_lines.export(collector)
+    json_lines.export(collector)
+    with open(jsonl_path, encoding="utf-8") as file:
+        records = [json.loads(line) for line in file]
+    assert [record["games"] for record in records] == [3, 3]
+    assert records[1]["reshuffles_per_game"] == 0.0
+
+
+def test_benchmark_suite(tmp_path):
+    """
+    Check that a tiny run of the benchmark suite writes every benchmark's
+    results as JSON.
+    """
+    output = tmp_path / "results.json"
+    benchmark_uno.main(["--scale", "0.002", "--output", str(output)])
+    results = json.loads(output.read_text())
+
+    assert set(results["benchmarks"]) == {
+        "deck", "draw_and_add", "reuse_discard_pile", "can_play", "games",
+        "large_table", "display"}
+    assert set(results["benchmarks"]["can_play"]) == {"7", "30", "100"}
+    assert results["benchmarks"]["games"]["games"] == 1
+
+
+def test_vector_games_keep_every_card():
+    """
+    Check that the NumPy lockstep engine never loses or duplicates cards, and
+    that every game ends with the winner holding no cards.
+    """
+    np = pytest.importorskip("numpy")
+    from uno_vector_engine import VectorGames  # pylint: disable=C0415
+
+    full_deck = np.bincount(np.array(DECK_LAYOUT), minlength=54)
+    games = VectorGames(50, num_players=3, seed=4)
+    while not games.won.all():
+        games.step()
+        for game in range(games.num_games):
+            counts = games.hands[game].sum(axis=0)
+            counts = counts + np.bincount(
+                games.draw_pile[game, :games.draw_size[game]], minlength=54)
+            counts = counts + np.bincount(
+                games.discard_pile[game, :games.discard_size[game]],
+                minlength=54)
+            assert (counts == full_deck).all()
+
+    for game in range(games.num_games):
+        assert games.hand_sizes[game, games.winner[game]] == 0
+    assert VectorGames(50, num_players=3, seed=4).run().results() == \
+        games.results()
+
+
+def test_mcts_bot_player():
+    """
+    Check that the MCTS bot tries every move during its search and plays a
+    legal card.
+    """
+    game = GameState(seed=6)
+    game.discard_pile = Deck(def_cards=[Card("Red", "5")])
+    mcts_bot = MCTSBotPlayer(game, "MCTS", play_card_delay=0,
+                             time_budget=None, max_rollouts=12)
+    player_list = [mcts_bot] + [BotPlayer(game, f"Bot {index}",
+                                          play_card_delay=0)
+                                for index in range(1, 4)]
+    GameDirector(player_list, game)
+    mcts_bot.hand = pack_cards([["Red", "1"], ["Blue", "5"], ["Wild", ""],
+                                ["Green", "2"]])
+
+    mcts_bot.take_turn()
+
+    # Red 1, Blue 5 and the Wild card in each of the four colors
+    assert len(mcts_bot.last_search) == 6
+    assert sum(visits for _, _, visits in mcts_bot.last_search) == 12
+    assert mcts_bot.num_cards() == 3
+    assert game.current_card().symbol in ("1", "5", "")
+    assert game.current_color() != "Wild"
+
+
+def test_parallel_mcts_bot_player():
+    """
+    Check that the process-pool MCTS bot merges the searches of its workers
+    and plays a legal card.
+    """
+    game = GameState(seed=7)
+    game.discard_pile = Deck(def_cards=[Card("Blue", "3")])
+    mcts_bot = ParallelMCTSBotPlayer(game, "MCTS", play_card_delay=0,
+                                     time_budget=None, max_rollouts=8,
+                                     workers=2)
+    player_list = [BotPlayer(game, "Bot 0", play_card_delay=0), mcts_bot,
+                   BotPlayer(game, "Bot 2", play_card_delay=0)]
+    director = GameDirector(player_list, game)
+    director.current_player_index = 1
+    mcts_bot.hand = pack_cards([["Blue", "1"], ["Red", "3"], ["Blue", "9"],
+                                ["Green", "2"]])
+
+    with mcts_bot:
+        mcts_bot.take_turn()
+    assert mcts_bot._executor is None
+
+    # The workers split the 8 rollouts between them, including the first one
+    # for each of the 3 moves
+    assert len(mcts_bot.last_search) == 3
+    assert sum(visits for _, _, visits in mcts_bot.last_search) == 8
+    assert mcts_bot.num_cards() == 3
+    assert ["Green", "2"] in unpack_cards(mcts_bot.hand)
+    assert unpack_cards([game.current_card()]) in ([["Blue", "1"]],
+                                                   [["Red", "3"]],
+                                                   [["Blue", "9"]])
+
+    # With more workers than the budget, every move is still tried once, but
+    # only once
+    mcts_bot.workers = 4
+    mcts_bot.max_rollouts = 2
+    director.current_player_index = 1
+    game.discard_pile.add_to_top(Card("Green", "5"))
+    mcts_bot.hand = pack_cards([["Green", "1"], ["Red", "5"], ["Green", "9"]])
+    with mcts_bot:
+        mcts_bot.take_turn()
+    assert [visits for _, _, visits in mcts_bot.last_search] == [1, 1, 1]
+
+
+def test_determinize():
+    """
+    Check that determinizing a snapshot keeps the seated player's hand and the
+    size and contents of everything else.
+    """
+    director = setup_game([BotPlayer] * 4, GameState(seed=9))
+    snapshot = director.snapshot()
+    dealt = determinize(snapshot, 2, director.game.rng)
+
+    assert dealt.hands[2] == snapshot.hands[2]
+    assert [len(hand) for hand in dealt.hands] == \
+        [len(hand) for hand in snapshot.hands]
+    assert sorted(dealt.game.draw_pile + b"".join(dealt.hands)) == \
+        sorted(snapshot.game.draw_pile + b"".join(snapshot.hands))
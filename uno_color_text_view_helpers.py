@@ -2,6 +2,9 @@
 Varibles holding string list representations of cards.
 """
 
+from collections import namedtuple
+from functools import lru_cache
+
 # Define useful colors
 WHITE = "\033[0m"
 RED = "\033[91m"
@@ -72,26 +75,39 @@ def put_in_card(symbol):
     return card
 
 
-def get_big_card(symbol):
+@lru_cache(maxsize=None)
+def load_big_card(symbol):
     """
-    Return the big/current card representation of the given symbol.
+    Read the big/current card ascii art of the given symbol from its file, once
+    per symbol.
 
     Args:
         symbol: A string representing the a symbol on an uno card (as it
             appears in the Card object).
     Returns:
-        A list of strings representing even rows of ascii art.
+        A tuple of strings representing even rows of ascii art. This is shared
+        by every caller, so it must not be changed.
     """
-
     # Pull the filepath from the dictionary
     filename = "ascii images/" + big_card_files[symbol]
-    # Get each line of the file as a string in a list
+    # Get each line of the file as a string, stripping off the newlines
     with open(filename, "r") as file:
-        card = file.readlines()
-    # Strip off the newlines
-    for line_num, _ in enumerate(card):
-        card[line_num] = card[line_num].strip("\n")
-    return card
+        return tuple(line.strip("\n") for line in file)
+
+
+def get_big_card(symbol):
+    """
+    Return the big/current card representation of the given symbol.
+
+    Args:
+        symbol: A string representing the a symbol on an uno card (as it
+            appears in the Card object).
+    Returns:
+        A new list of strings representing even rows of ascii art, which the
+        caller can change (e.g. with color_card_rep) without affecting the
+        cached art.
+    """
+    return list(load_big_card(symbol))
 
 
 def color_card_rep(card_rep, color):
@@ -121,34 +137,210 @@ def color_card_rep(card_rep, color):
         return card_rep
 
 
+@lru_cache(maxsize=None)
+def small_card_sprite(symbol, color):
+    """
+    Return the finished, colored small/hand card representation of the given
+    symbol and color, building it the first time it's asked for.
+
+    Args:
+        symbol: A string representing the a symbol on an uno card (as it
+            appears in the Card object).
+        color: A string representing the the color of an uno card (as it
+            appears in the Card object).
+    Returns:
+        A tuple of strings representing even rows of colored ascii art. This is
+        shared by every caller, so it must not be changed.
+    """
+    return tuple(color_card_rep(put_in_card(symbol), color))
+
+
+@lru_cache(maxsize=None)
+def big_card_sprite(symbol, color):
+    """
+    Return the finished, colored big/current card representation of the given
+    symbol and color, building it the first time it's asked for.
+
+    Args:
+        symbol: A string representing the a symbol on an uno card (as it
+            appears in the Card object).
+        color: A string representing the the color of an uno card (as it
+            appears in the Card object), or the color chosen for a Wild card.
+    Returns:
+        A tuple of strings representing even rows of colored ascii art. This is
+        shared by every caller, so it must not be changed.
+    """
+    return tuple(color_card_rep(get_big_card(symbol), color))
+
+
+def card_rows(card_list):
+    """
+    Return the rows of a list of card representations placed side by side.
+
+    Args:
+        card_list: A list of sequences of strings (e.g. sprites from
+            small_card_sprite), where each sequence represents a card. All of
+            the sequences must be the same length and all of the strings in a
+            sequence are the same length.
+    Returns:
+        A list of strings, one for each row.
+    """
+    return ["".join(row) for row in zip(*card_list)]
+
+
 def print_cards(card_list):
     """
     Print a list of card representations side by side to the terminal.
 
     Args:
-        card_list: A list of lists of strings, where each sublist represents a
-            card. All of the sublists must be the same length and all of the
-            strings in a sublist are the same length.
-    """
-    print_rows = []
-    num_rows = len(card_list[0])
-    for i in range(num_rows):
-        new_row = ""
-        for card in card_list:
-            new_row = new_row + card[i]
-        print_rows.append(new_row)
-
-    for row in print_rows:
+        card_list: A list of sequences of strings (e.g. sprites from
+            small_card_sprite), where each sequence represents a card. All of
+            the sequences must be the same length and all of the strings in a
+            sequence are the same length.
+    """
+    for row in card_rows(card_list):
         print(row)
 
 
+# Define the unicode arrows used to show the direction of play, and the arrow
+# pointing the other way for each of them
+ARROW_REVERSALS = {"\u2197": "\u2199",  # ↗ and ↙
+                   "\u2198": "\u2196",  # ↘ and ↖
+                   "\u2191": "\u2193",  # ↑ and ↓
+                   "\u2192": "\u2190"}  # → and ←
+ARROW_REVERSALS.update({arrow: reverse
+                        for reverse, arrow in list(ARROW_REVERSALS.items())})
+
+# The layout of the players around the table, for one player count and set of
+# names. forward and backward are tuples of format strings (one per row, for
+# each direction of play) with a numbered field for each player's card count,
+# and count_slots has the (name length, str justify method name, width) of
+# each player's card count field.
+RingLayout = namedtuple("RingLayout", ["forward", "backward", "count_slots"])
+
+
+@lru_cache(maxsize=None)
+def ring_layout(names):
+    """
+    Build the template for showing players and the number of cards they have
+    on a ring, with arrows indicating the direction of play.
+
+    The first player is at the bottom and the rest go clockwise around the
+    ring (up the left side, across the top and down the right side), so the
+    usual 4 players make a diamond. The ring is meant for 2 to 10 players.
+
+    Args:
+        names: A tuple of strings representing the players' names, in the
+            order they play.
+    Returns:
+        A RingLayout.
+    """
+    num_players = len(names)
+    num_left = (num_players - 1) // 2
+    has_top = num_players % 2 == 0
+    first_right = num_left + 1 + has_top
+
+    # Make the sides wide enough for every name
+    side_names = [names[index] for index in range(1, num_players)
+                  if not (has_top and index == num_left + 1)]
+    half_width = max([8] + [len(name) for name in side_names] +
+                     [(len(names[index]) + 1) // 2 for index in
+                      ({0, num_left + 1} if has_top else {0})])
+    full_width = half_width*2 + 1
+
+    # List the tiers from top to bottom, as tuples of player indices
+    tiers = []
+    if has_top:
+        tiers.append((num_left + 1,))
+    for tier_num in range(num_left):
+        tiers.append((num_left - tier_num, first_right + tier_num))
+    tiers.append((0,))
+
+    count_slots = [None] * num_players
+    forward = []
+    backward = []
+
+    def add_row(*parts):
+        """
+        Add a row to both directions' templates. Parts that are tuples of
+        arrows pointing clockwise are reversed in the backward template.
+        """
+        for rows, reverse in ((forward, False), (backward, True)):
+            row = ""
+            for part in parts:
+                if isinstance(part, tuple):
+                    arrow, width = part
+                    if reverse:
+                        arrow = ARROW_REVERSALS[arrow]
+                    part = arrow.center(width)
+                row += part
+            rows.append(row)
+
+    for tier_num, tier in enumerate(tiers):
+        if tier_num > 0:
+            # Point the arrows clockwise, between this tier and the one above
+            upper = tiers[tier_num - 1]
+            if len(upper) == 1 and len(tier) == 2:
+                arrows = ("\u2197", "\u2198")  # ↗ ↘
+            elif len(upper) == 2 and len(tier) == 1:
+                arrows = ("\u2196", "\u2199")  # ↖ ↙
+            else:
+                arrows = ("\u2191", "\u2193")  # ↑ ↓
+            add_row((arrows[0], half_width), " ", (arrows[1], half_width))
+
+        if len(tier) == 1:
+            index = tier[0]
+            add_row(escape_braces(names[index].center(full_width)))
+            add_row("{" + str(index) + "}")
+            count_slots[index] = (len(names[index]), "center", full_width)
+        else:
+            left, right = tier
+            # Without a top player, the top tier plays left to right
+            middle = ("\u2192", 1) if tier_num == 0 else " "
+            add_row(escape_braces(names[left].ljust(half_width)), middle,
+                    escape_braces(names[right].rjust(half_width)))
+            add_row("{" + str(left) + "} {" + str(right) + "}")
+            count_slots[left] = (len(names[left]), "ljust", half_width)
+            count_slots[right] = (len(names[right]), "rjust", half_width)
+
+    return RingLayout(tuple(forward), tuple(backward), tuple(count_slots))
+
+
+def escape_braces(text):
+    """
+    Return text with its braces doubled, so it can be put in a format string.
+    """
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def fill_ring(layout, card_counts, direction):
+    """
+    Fill in a ring layout with the players' card counts.
+
+    Args:
+        layout: A RingLayout from ring_layout().
+        card_counts: A list of ints representing the number of cards each
+            player has, in the order they play.
+        direction: An int that is 1 for clockwise/forwards play or -1 for
+            counterclockwise/backwards play.
+    Returns:
+        A list of strings.
+    """
+    counts = [getattr(f"({count})".center(name_length), justify)(width)
+              for count, (name_length, justify, width)
+              in zip(card_counts, layout.count_slots)]
+    rows = layout.forward if direction == 1 else layout.backward
+    return [row.format(*counts) for row in rows]
+
+
 def other_players_as_big_card(players_rep):
     """
     Add more blank lines to the top and bottom of a list of strings in order to
     make it the same size as a big card.
 
-    This is used for displaying the current card and player diamond next to
-    each other.
+    This is used for displaying the current card and player ring next to
+    each other. Rings taller than a big card are left as they are (see
+    pad_big_card).
     """
     big_card_lines = 11
     big_card_players_rep = []
@@ -164,3 +356,18 @@ def other_players_as_big_card(players_rep):
         big_card_players_rep.append(blank_line)
 
     return big_card_players_rep
+
+
+def pad_big_card(card_rep, num_lines):
+    """
+    Add blank lines to the bottom of a big card representation to make it
+    num_lines long, so it can be shown next to a taller player ring.
+
+    Args:
+        card_rep: A sequence of strings representing a big card.
+        num_lines: An int representing the number of lines to pad it to.
+    Returns:
+        A list of strings.
+    """
+    blank_line = " " * 21
+    return list(card_rep) + [blank_line] * (num_lines - len(card_rep))
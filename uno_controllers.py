@@ -2,9 +2,15 @@
 Classes representing human and computer uno players.
 """
 
-import random
-import time
 from abc import ABC, abstractmethod
+from uno_deck import Hand
+from uno_events import (
+    CardPlayed,
+    CardsDrawn,
+    PlayerSkipped,
+    ColorChosen,
+    GameWon
+)
 
 
 class Player(ABC):
@@ -20,8 +26,14 @@ class Player(ABC):
             used if play_card_delay is not defined when initializing the player.
         game: A GameState instance representing the uno game the player is in.
         name: A string representing the player's name.
+        hand: A Hand of Cards that the player has to play.
         play_card_delay: a float representing the number of seconds the player
-            should wait after playing their card before ending their turn.
+            should wait after playing their card before ending their turn. The
+            player doesn't wait itself; an interactive driver loop waits for a
+            TurnPacer (from uno_pacing) before the next turn.
+        director: The GameDirector instance running the player's game (set by
+            the GameDirector), or None if the player isn't seated at a table
+            yet.
     """
     player_type = None
     default_delay = None
@@ -34,7 +46,6 @@ class Player(ABC):
             game: A GameState instance representing the uno game the player is
                 in.
             name: A string representing the player's name.
-            hand: A list of Cards that the player has to play.
             play_card_delay: (optional) an float greater than 0 representing
                 the number of seconds the player should wait after playing
                 their card before turn, to make it easier to see what bots play.
@@ -43,6 +54,28 @@ class Player(ABC):
         self.name = player_name
         self.hand = self.game.draw(7)
         self.play_card_delay = self.get_play_card_delay(play_card_delay)
+        self.director = None
+
+    @property
+    def hand(self):
+        """
+        Return the player's Hand of cards.
+        """
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards):
+        """
+        Replace the player's hand with the given cards.
+
+        Args:
+            cards: A Hand to use, or an iterable of Cards (e.g. a list) to put
+                in a new hand.
+        """
+        if isinstance(cards, Hand):
+            self._hand = cards
+        else:
+            self._hand = Hand(cards)
 
     def take_turn(self):
         """
@@ -62,11 +95,11 @@ class Player(ABC):
             # as won and congratulate the winner
             if self.num_cards() == 0:
                 self.game.won = True
-                print(f"{self.name} won!")
+                self.publish(GameWon)
         else:
             # If the player has no playable cards in their hand, announce this
             # and have them draw 1 card.
-            print(f"No play possible - {self.name} draws 1 card.")
+            self.publish(CardsDrawn, 1, None)
             self.draw(1)
             return
 
@@ -82,20 +115,23 @@ class Player(ABC):
             False if no action was handled (the player can continue).
         """
         if self.game.current_action == "Skip":
-            print(f"{self.name} was skipped.")
+            self.publish(PlayerSkipped)
             self.game.current_action = None
+            self.game.actions_resolved += 1
             return True
 
         if self.game.current_action == "+2":
             self.draw(2)
-            print(f"{self.name} drew 2 cards and misses their turn.")
+            self.publish(CardsDrawn, 2, "+2")
             self.game.current_action = None
+            self.game.actions_resolved += 1
             return True
 
         if self.game.current_action == "+4":
             self.draw(4)
-            print(f"{self.name} drew 4 cards and misses their turn.")
+            self.publish(CardsDrawn, 4, "+4")
             self.game.current_action = None
+            self.game.actions_resolved += 1
             return True
 
         return False
@@ -115,24 +151,22 @@ class Player(ABC):
         """
         if self.check_play(card):  # If the play is valid
             # Announce the played card
-            print(f"{self.name} played {card}.")
+            self.publish(CardPlayed, card)
+
+            # Remove the card from the player's hand
+            self.hand.remove(card)
 
             # If the card is Wild, allow the player to choose the color
-            if card.color == "Wild":
+            if card.is_wild():
                 card = self.choose_color(card, choose_manual_input)
 
             # If the card is an action card, set the game's current_action to
             # the card's symbol
-            if (card.symbol == "Reverse" or
-                card.symbol == "Skip" or
-                card.symbol == "+2" or
-                    card.symbol == "+4"):
+            if card.is_action():
                 self.game.current_action = card.symbol
 
             # Add the card to the top of the game's discard pile
             self.game.play_card(card)
-            # Remove the card from the player's hand
-            self.hand.remove(card)
             # Return True to indicate a sucessful play
             return True
         return False
@@ -144,11 +178,7 @@ class Player(ABC):
         Returns:
             True if the play is valid, False if it is not allowed.
         """
-        if (card.color == self.game.current_card().color or
-            card.symbol == self.game.current_card().symbol or
-                card.color == "Wild"):
-            return True
-        return False
+        return card.can_play_on(self.game.current_card())
 
     def num_cards(self):
         """
@@ -176,10 +206,20 @@ class Player(ABC):
             True if the player has a card that can be played, False if they
             don't (and will need to draw a card and end their turn).
         """
-        for card in self.hand:
-            if self.check_play(card):
-                return True
-        return False
+        return self.hand.can_play(self.game.current_card())
+
+    def publish(self, event_type, *fields):
+        """
+        Publish an event about this player to the game's event bus, without
+        creating the event if nobody is observing the game.
+
+        Args:
+            event_type: One of the event namedtuples from uno_events.
+            *fields: The event's fields after player.
+        """
+        events = self.game.events
+        if events.observers:
+            events.publish(event_type(self, *fields))
 
     def get_play_card_delay(self, delay):
         """
@@ -218,7 +258,7 @@ class Player(ABC):
                 "b", or "y") representing what color the player wants to
                 declare the wild card to be.
         Returns:
-            The card with the chosen_color changed to the player's choice.
+            A copy of the card with the player's choice as its chosen_color.
         """
 
     def __repr__(self):
@@ -263,7 +303,7 @@ class UserPlayerTextController(Player):
                 "b", or "y") representing what color the player wants to
                 declare the wild card to be.
         Returns:
-            The card with the chosen_color changed to the player's choice.
+            A copy of the card with the player's choice as its chosen_color.
         """
         while True:
             if manual_input is None:
@@ -273,17 +313,13 @@ class UserPlayerTextController(Player):
                 text = manual_input
 
             if text == "r":
-                card.set_chosen_color("Red")
-                return card
+                return card.with_chosen_color("Red")
             if text == "g":
-                card.set_chosen_color("Green")
-                return card
+                return card.with_chosen_color("Green")
             if text == "b":
-                card.set_chosen_color("Blue")
-                return card
+                return card.with_chosen_color("Blue")
             if text == "y":
-                card.set_chosen_color("Yellow")
-                return card
+                return card.with_chosen_color("Yellow")
 
             print("That is not a valid input. Please enter 'r' for"
                     " Red, 'g' for Green, 'b' for Blue, or 'y' for"
@@ -302,11 +338,9 @@ class BotPlayer(Player):
         Have the bot player play the first card in their hand that is a valid
         play.
         """
-        for card in self.hand:
-            if self.play_card(card):
-                if self.play_card_delay > 0:
-                    time.sleep(self.play_card_delay)
-                return
+        card = self.hand.first_playable(self.game.current_card())
+        if card is not None:
+            self.play_card(card)
 
     def choose_color(self, card, manual_input=None):
         """
@@ -318,9 +352,9 @@ class BotPlayer(Player):
             manual_input: This is for testing the UserPlayerTextController
                 interface, and is not used here.
         Returns:
-            The card with the chosen_color changed to the player's choice.
+            A copy of the card with the player's choice as its chosen_color.
         """
-        card.set_chosen_color(random.choice(
+        card = card.with_chosen_color(self.game.rng.choice(
             ["Red", "Blue", "Green", "Yellow"]))
-        print(f"{self.name} chose {card.color}.")
+        self.publish(ColorChosen, card.color)
         return card
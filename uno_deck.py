@@ -1,20 +1,104 @@
 """
-Classes representing uno cards and a deck of uno cards.
+Classes representing uno cards, a deck of uno cards and a player's hand of uno
+cards, and the table of the distinct card types they are made from.
 """
 
 import random
+from collections import namedtuple
+
+
+# The card colors and symbols, in the order of their color and symbol indices
+COLORS = ("Red", "Blue", "Green", "Yellow", "Wild")
+SYMBOLS = ("0", "1", "2", "3", "4", "5", "6", "7", "8", "9",
+           "Reverse", "Skip", "+2", "", "+4")
+COLOR_INDICES = {color: index for index, color in enumerate(COLORS)}
+SYMBOL_INDICES = {symbol: index for index, symbol in enumerate(SYMBOLS)}
+WILD_INDEX = COLOR_INDICES["Wild"]
+
+# A distinct kind of uno card, with everything about it that never changes
+# worked out ahead of time. type_id is the card type's index in CARD_TYPES and
+# bit is 1 << type_id (or 0 for a type that isn't in CARD_TYPES).
+CardType = namedtuple("CardType", ["type_id", "color", "symbol", "color_index",
+                                   "symbol_index", "special", "action", "wild",
+                                   "bit"])
+
+
+def make_card_type(type_id, color, symbol):
+    """
+    Return a CardType with the flags worked out from its color and symbol.
+
+    Args:
+        type_id: An int representing the index of the type in CARD_TYPES, or
+            None for a color and symbol pair that isn't in a real deck.
+        color: A string representing the color of the card.
+        symbol: A string representing the symbol or action on the card.
+    """
+    action = symbol in ("Reverse", "Skip", "+2", "+4")
+    return CardType(type_id, color, symbol, COLOR_INDICES[color],
+                    SYMBOL_INDICES[symbol], action or symbol == "", action,
+                    color == "Wild", 0 if type_id is None else 1 << type_id)
+
+
+# The 54 distinct cards in an uno deck: 13 for each of the four colors, then
+# the two Wild cards
+CARD_TYPES = tuple(
+    make_card_type(index, color, symbol) for index, (color, symbol)
+    in enumerate([(color, symbol) for color in COLORS[:4]
+                  for symbol in SYMBOLS[:13]] + [("Wild", ""), ("Wild", "+4")]))
+CARD_TYPE_IDS = {(card_type.color, card_type.symbol): card_type.type_id
+                 for card_type in CARD_TYPES}
+
+
+def make_playable_mask(symbol_index, color_index):
+    """
+    Return a bitmask of the card types that can be played on a current card
+    with the given symbol and (chosen) color.
+
+    A card can be played if it matches the current card's color or symbol, or
+    if it is Wild.
+
+    Args:
+        symbol_index: An int representing the index in SYMBOLS of the current
+            card's symbol.
+        color_index: An int representing the index in COLORS of the current
+            card's color, or of the chosen color if it is Wild.
+    Returns:
+        An int with bit type_id set for every playable type in CARD_TYPES.
+    """
+    mask = 0
+    for card_type in CARD_TYPES:
+        if (card_type.wild or card_type.color_index == color_index or
+                card_type.symbol_index == symbol_index):
+            mask |= card_type.bit
+    return mask
+
+
+# The bitmask of playable card types for every current card type and every
+# color in COLORS it could have (only Wild cards can take colors other than
+# their own), indexed as PLAYABLE_MASKS[type_id][color_index]
+PLAYABLE_MASKS = tuple(
+    tuple(make_playable_mask(card_type.symbol_index, color_index)
+          for color_index, _ in enumerate(COLORS))
+    for card_type in CARD_TYPES)
 
 
 class Card:
     """
     A representation of an Uno card.
 
+    A Card is a light view over one of the shared CardTypes, plus the color a
+    player chose for it if it is Wild. Cards never change once they are
+    created (with_chosen_color() returns a colored copy instead), so they can
+    be shared between every Deck and Hand.
+
     Attributes:
-        _color: A string representing the color of the card.
-        _symbol: A string representing the symbol or action on the card.
+        _type: The CardType this card is an instance of.
         _chosen_color: A string representing the color chosen by the player
-                when _color is "Wild".
+                when the card's color is "Wild".
+        _color_index: An int representing the index in COLORS of the card's
+            color, or of the chosen color if one has been chosen.
     """
+    __slots__ = ("_type", "_chosen_color", "_color_index")
 
     def __init__(self, color, symbol):
         """
@@ -28,54 +112,99 @@ class Card:
             color: A string representing the color.
             symbol: A string represening the number or action on the card.
         """
-        self._color = color
-        self._symbol = symbol
+        type_id = CARD_TYPE_IDS.get((color, symbol))
+        if type_id is None:
+            self._type = make_card_type(None, color, symbol)
+        else:
+            self._type = CARD_TYPES[type_id]
         self._chosen_color = ""
+        self._color_index = self._type.color_index
 
-    def set_chosen_color(self, new_color):
+    @classmethod
+    def from_type_id(cls, type_id):
         """
-        Set the _chosen_color attribute if the card is a "Wild" card.
+        Create a new Card of the type in CARD_TYPES with the given type_id.
+
+        Args:
+            type_id: An int representing the index of the card type in
+                CARD_TYPES.
+        """
+        card = cls.__new__(cls)
+        card._type = CARD_TYPES[type_id]
+        card._chosen_color = ""
+        card._color_index = card._type.color_index
+        return card
+
+    def with_chosen_color(self, new_color):
+        """
+        Return a Card like this one with a chosen color, without changing this
+        card.
+
+        Wild cards of the types in CARD_TYPES share one Card for each chosen
+        color (see CHOSEN_COLOR_CARDS), so choosing a color doesn't create a
+        new Card. Cards that aren't Wild are returned as they are.
 
         Args:
             new_color: A string representing the color the Wild card should
                 behave as.
         """
-        if self._color == "Wild":
-            self._chosen_color = new_color
+        if not self._type.wild:
+            return self
+        card = CHOSEN_COLOR_CARDS.get((self._type.type_id, new_color))
+        if card is None:
+            card = self._colored_copy(new_color)
+        return card
 
-    def strip_chosen_color(self):
+    def _colored_copy(self, new_color):
         """
-        Reset _chosen_color back to "", in case it had been defined by a player
-        before.
+        Return a new Card of the same type as this one, with a chosen color.
+
+        Args:
+            new_color: A string representing the color the Wild card should
+                behave as.
         """
-        self._chosen_color = ""
+        card = Card.__new__(Card)
+        card._type = self._type
+        card._chosen_color = new_color
+        card._color_index = COLOR_INDICES[new_color]
+        return card
 
     def is_special(self):
         """
         Return whether or not the card has a special non-number symbol.
         """
-        if (self.symbol == "Reverse" or self.symbol == "Skip"
-            or self.symbol == "+2" or self.symbol == "+4"
-                or self.symbol == ""):
-            return True
-        return False
+        return self._type.special
+
+    def is_action(self):
+        """
+        Return whether or not the card has an action ("Reverse", "Skip", "+2"
+        or "+4") for the game to handle.
+        """
+        return self._type.action
+
+    def is_wild(self):
+        """
+        Return whether or not the card is a Wild card, whether or not its color
+        has been chosen.
+        """
+        return self._type.wild
 
     @property
     def color(self):
         """
-        Return the card's private attribute _color if the card is not Wild, or
-        _chosen_color if the card is Wild and the color has been chosen.
+        Return the card type's color if the card is not Wild, or _chosen_color
+        if the card is Wild and the color has been chosen.
         """
-        if self._color == "Wild" and self.chosen_color != "":
-            return self.chosen_color
-        return self._color
+        if self._chosen_color:
+            return self._chosen_color
+        return self._type.color
 
     @property
     def symbol(self):
         """
-        Return the private attribute _symbol.
+        Return the card type's symbol.
         """
-        return self._symbol
+        return self._type.symbol
 
     @property
     def chosen_color(self):
@@ -84,35 +213,132 @@ class Card:
         """
         return self._chosen_color
 
+    @property
+    def color_index(self):
+        """
+        Return the index in COLORS of the card's (chosen) color.
+        """
+        return self._color_index
+
+    @property
+    def symbol_index(self):
+        """
+        Return the index in SYMBOLS of the card's symbol.
+        """
+        return self._type.symbol_index
+
+    def playable_mask(self):
+        """
+        Return the bitmask of the card types that can be played on this card,
+        taking the chosen color into account.
+        """
+        if self._type.type_id is None:
+            return make_playable_mask(self._type.symbol_index,
+                                      self._color_index)
+        return PLAYABLE_MASKS[self._type.type_id][self._color_index]
+
+    def can_play_on(self, current_card):
+        """
+        Return whether or not this card can be played on the current card.
+
+        Args:
+            current_card: The Card on top of the discard pile.
+        """
+        if self._type.bit:
+            return bool(current_card.playable_mask() & self._type.bit)
+        # Cards that aren't in CARD_TYPES don't have a bit in the masks
+        return (self._type.wild or
+                self._type.color_index == current_card.color_index or
+                self._type.symbol_index == current_card.symbol_index)
+
+    @property
+    def card_type(self):
+        """
+        Return the CardType this card is an instance of.
+        """
+        return self._type
+
+    @property
+    def type_id(self):
+        """
+        Return the index of the card's type in CARD_TYPES (or None if the card
+        isn't one of the cards in a real deck).
+        """
+        return self._type.type_id
+
     def __repr__(self):
         """
         Returns a representation of the card as <color> <symbol>
         (<chosen_color>), with chosen_color only added if applicable,
         overwriting the default representation of Card.
         """
-        if self._color == "Wild":
+        if self._type.wild:
             if self.chosen_color != "":
                 if self.symbol == "":
-                    return f"{self._color} ({self.chosen_color})"
-                return f"{self._color} {self.symbol} ({self.chosen_color})"
+                    return f"{self._type.color} ({self.chosen_color})"
+                return (f"{self._type.color} {self.symbol} "
+                        f"({self.chosen_color})")
             if self.symbol == "":
                 return f"{self.color}"
         return f"{self.color} {self.symbol}"
 
 
+# The type ids of the cards in a full deck, in order: for each color one "0"
+# and two of each other card, then six of each Wild card
+DECK_LAYOUT = tuple(
+    [type_id for color_index in range(4)
+     for type_id in [color_index * 13] +
+     list(range(color_index * 13 + 1, color_index * 13 + 13)) * 2] +
+    [CARD_TYPE_IDS[("Wild", symbol)] for _ in range(6)
+     for symbol in ("", "+4")])
+
+# Cards never change (a chosen color is recorded by playing a colored copy of
+# a Wild card instead), so every Deck and Hand shares these Card instances
+# instead of creating its own
+SHARED_CARDS = tuple(Card.from_type_id(card_type.type_id)
+                     for card_type in CARD_TYPES)
+SHARED_DECK_CARDS = tuple(SHARED_CARDS[type_id] for type_id in DECK_LAYOUT)
+
+# The shared Wild Cards with each color chosen, indexed by (type_id, color)
+CHOSEN_COLOR_CARDS = {
+    (card_type.type_id, color):
+        SHARED_CARDS[card_type.type_id]._colored_copy(color)
+    for card_type in CARD_TYPES if card_type.wild for color in COLORS[:4]}
+
+
+def cards_from_type_ids(type_ids):
+    """
+    Return a list of the shared Cards with the given type ids.
+
+    Args:
+        type_ids: An iterable of ints representing indices in CARD_TYPES
+            (e.g. bytes from Deck.type_ids() or Hand.type_ids()).
+    """
+    return [SHARED_CARDS[type_id] for type_id in type_ids]
+
+
 class Deck:
     """
     A representation of an Uno deck.
 
+    The cards are kept as a stack with the top of the deck at the end of the
+    list, so that drawing from and adding to the top don't have to move the
+    rest of the cards.
+
     Attributes:
-        cards: A list of Card instances.
+        _cards: A list of Card instances, from the bottom of the deck to the
+            top.
+        rng: A random.Random instance (or the random module) used to shuffle
+            the deck.
     """
 
-    def __init__(self, def_cards=None, is_empty=False):
+    def __init__(self, def_cards=None, is_empty=False, rng=None,
+                 num_decks=1):
         """
         Initialize a deck object.
 
-        Default is a full (unshuffled) deck with 112 cards.
+        Default is a full (unshuffled) deck with 112 cards, or num_decks copies
+        of it for large tables.
             - 25 of each color (of Red, Green, Blue, and Yellow).
               Within each color:
                 - One "0"
@@ -124,43 +350,56 @@ class Deck:
                   next player must draw 4 cards and miss their turn
 
         Args:
-            def_cards: A list of Card objects, in case the deck should be
-                defined manually (e.g. reusing discards, running tests)
+            def_cards: A list of Card objects from the top of the deck to the
+                bottom, in case the deck should be defined manually (e.g.
+                reusing discards, running tests)
             is_empty: A boolean denoting if the Deck should be initialized as
                 an empty list with no Cards in it (e.g. the discard pile)
+            rng: (optional) A random.Random instance to shuffle the deck with,
+                default is the random module's global generator.
+            num_decks: (optional) An int representing the number of 112 card
+                decks to put together, default is 1.
         """
+        self.rng = random if rng is None else rng
 
         # Use only the defined cards if they are given
         if def_cards is not None:
-            self.cards = def_cards
+            self._cards = def_cards[::-1]
             return
 
-        # Initialize the cards attribute as an empty list
-        self.cards = []
-
         # If the deck is meant to be empty (e.g. the discard pile during setup)
         # then stop now
         if is_empty:
+            self._cards = []
             return
 
-        # Add the 112 cards in a normal uno deck
-        for color in ["Red", "Blue", "Green", "Yellow"]:
-            self.cards.append(Card(color, "0"))
-            for _ in range(2):
-                for num in range(1, 10):
-                    self.cards.append(Card(color, str(num)))
-                self.cards.append(Card(color, "Reverse"))
-                self.cards.append(Card(color, "Skip"))
-                self.cards.append(Card(color, "+2"))
-        for _ in range(6):
-            self.cards.append(Card("Wild", ""))
-            self.cards.append(Card("Wild", "+4"))
+        # Add the 112 shared cards in each normal uno deck, then flip them so
+        # the first card is on top
+        self._cards = list(SHARED_DECK_CARDS) * num_decks
+        self._cards.reverse()
+
+    @property
+    def cards(self):
+        """
+        Return a list of the Cards in the deck, from the top to the bottom.
+        """
+        return self._cards[::-1]
+
+    @cards.setter
+    def cards(self, new_cards):
+        """
+        Replace the cards in the deck.
+
+        Args:
+            new_cards: A list of Cards from the top of the deck to the bottom.
+        """
+        self._cards = new_cards[::-1]
 
     def shuffle(self):
         """
         Shuffle the cards in the deck.
         """
-        random.shuffle(self.cards)
+        self.rng.shuffle(self._cards)
 
     def draw(self, num_cards=1):
         """
@@ -172,41 +411,86 @@ class Deck:
         Returns:
             A list of Cards (even if only one card is requested).
         """
-        drawn_cards = self.cards[:num_cards]
-        self.cards = self.cards[num_cards:]
+        if num_cards <= 0:
+            return []
+        drawn_cards = self._cards[-num_cards:]
+        del self._cards[-num_cards:]
+        drawn_cards.reverse()
         return drawn_cards
 
     def show_top(self):
         """
         Return the top card of the Deck without removing it.
         """
-        return self.cards[0]
+        return self._cards[-1]
 
     def add_to_top(self, new_card):
         """
         Add a single new card to the top of the Deck.
 
         Args:
-            new_card: A single Card object to be added to the top/beginning
-                of the Deck/list.
+            new_card: A single Card object to be added to the top of the Deck.
         """
-        self.cards.insert(0, new_card)
+        self._cards.append(new_card)
 
     def add_to_bottom(self, new_cards):
         """
         Add a list of cards to the bottom of the Deck.
 
         Args:
-            new_cards: A list of Cards to be added to the bottom/end of the
-                Deck/list
+            new_cards: A list of Cards to be added to the bottom of the Deck,
+                with the last card in the list ending up at the very bottom.
+        """
+        self._cards[:0] = new_cards[::-1]
+
+    def move_under(self, deck):
         """
-        self.cards.extend(new_cards)
+        Move all of the cards in this Deck to the bottom of another Deck,
+        leaving this Deck empty.
+
+        The two Decks swap their lists of cards rather than copying the cards
+        from one list to the other, so nothing is done for each card when the
+        other Deck is the smaller one (e.g. the few cards left in the draw
+        pile when the discard pile is reused).
+
+        Args:
+            deck: The Deck to put the cards under.
+        """
+        cards = self._cards
+        cards.extend(deck._cards)
+        deck._cards.clear()
+        self._cards, deck._cards = deck._cards, cards
 
     def size(self):
         """
         Return the number of cards in the Deck.
         """
-        return len(self.cards)
+        return len(self._cards)
+
+    def type_ids(self):
+        """
+        Return the type ids of the cards in the Deck as compact bytes, from
+        the bottom of the deck to the top.
+
+        Wild cards' chosen colors aren't included, and every card must be one
+        of the types in CARD_TYPES.
+        """
+        return bytes([card.type_id for card in self._cards])
+
+    @classmethod
+    def from_type_ids(cls, type_ids, rng=None):
+        """
+        Create a Deck from the type ids returned by Deck.type_ids().
+
+        Args:
+            type_ids: Bytes (or another iterable of ints) representing the
+                type ids of the cards from the bottom of the deck to the top.
+            rng: (optional) A random.Random instance to shuffle the deck with,
+                default is the random module's global generator.
+        """
+        deck = cls(is_empty=True, rng=rng)
+        deck._cards = cards_from_type_ids(type_ids)
+        return deck
 
     def __repr__(self):
         """
@@ -214,3 +498,261 @@ class Deck:
         representation of Deck.
         """
         return f"Deck with cards {self.cards}"
+
+
+class Hand:
+    """
+    A representation of the cards in a player's hand.
+
+    A Hand behaves like a list of Cards (in the order the player sees them),
+    but also keeps a bitmask of the card types in it and the cards sorted into
+    buckets by color and by symbol. can_play() takes the same time whatever
+    the hand's size, and the matching cards are found without checking every
+    card, but finding a card's place in the hand (in first_playable() and
+    remove()) still means a list search proportional to the hand's size.
+
+    Cards of the types in CARD_TYPES are kept as the shared Cards in
+    SHARED_CARDS, whichever Card of that type was added.
+
+    Attributes:
+        _cards: A list of Card instances, in the order they are in the hand.
+        _type_counts: A list with the number of cards of each type in
+            CARD_TYPES in the hand.
+        _type_mask: An int with bit type_id set for every card type the hand
+            has at least one card of.
+        _untyped: A list of the Cards in the hand whose color and symbol aren't
+            in CARD_TYPES (and so aren't in the bitmask).
+        _by_color: A list with one list of Cards for each color in COLORS
+            (using the card's own color, so Wild cards are all in the
+            WILD_INDEX bucket), each in hand order.
+        _by_symbol: A list with one list of Cards for each symbol in SYMBOLS,
+            each in hand order.
+    """
+
+    def __init__(self, cards=()):
+        """
+        Initialize a hand with the given cards.
+
+        Args:
+            cards: (optional) An iterable of Cards to start the hand with,
+                default is an empty hand.
+        """
+        self._cards = []
+        self._type_counts = [0] * len(CARD_TYPES)
+        self._type_mask = 0
+        self._untyped = []
+        self._by_color = [[] for _ in COLORS]
+        self._by_symbol = [[] for _ in SYMBOLS]
+        self.extend(cards)
+
+    def append(self, card):
+        """
+        Add a card to the end of the hand.
+
+        Args:
+            card: The Card to add.
+        """
+        card = self._shared(card)
+        self._cards.append(card)
+        self._count(card)
+        self._by_color[card.card_type.color_index].append(card)
+        self._by_symbol[card.symbol_index].append(card)
+
+    def extend(self, cards):
+        """
+        Add a list of cards to the end of the hand.
+
+        Args:
+            cards: An iterable of Cards to add.
+        """
+        for card in cards:
+            self.append(card)
+
+    def insert(self, index, card):
+        """
+        Add a card to the hand before the given index.
+
+        Args:
+            index: An int representing the position in the hand the card should
+                end up at.
+            card: The Card to add.
+        """
+        card = self._shared(card)
+        # Put the card into its buckets after the bucket cards that come
+        # before it in the hand, to keep the buckets in hand order
+        before = self._cards[:index]
+        color_index = card.card_type.color_index
+        symbol_index = card.symbol_index
+        self._by_color[color_index].insert(
+            sum(1 for other in before
+                if other.card_type.color_index == color_index), card)
+        self._by_symbol[symbol_index].insert(
+            sum(1 for other in before if other.symbol_index == symbol_index),
+            card)
+        self._cards.insert(index, card)
+        self._count(card)
+
+    def remove(self, card):
+        """
+        Remove a card from the hand.
+
+        This searches the hand's list and the card's two buckets (with
+        list.remove), so it takes time proportional to the size of the hand.
+
+        Args:
+            card: The Card to remove, or any Card of the same type (such as a
+                Wild card with a chosen color) if it is one of the types in
+                CARD_TYPES.
+        Raises:
+            ValueError: If the card is not in the hand.
+        """
+        card = self._shared(card)
+        self._cards.remove(card)
+        card_type = card.card_type
+        if card_type.bit:
+            self._type_counts[card_type.type_id] -= 1
+            if self._type_counts[card_type.type_id] == 0:
+                self._type_mask &= ~card_type.bit
+        else:
+            self._untyped.remove(card)
+        self._by_color[card_type.color_index].remove(card)
+        self._by_symbol[card.symbol_index].remove(card)
+
+    @staticmethod
+    def _shared(card):
+        """
+        Return the shared Card for a card of one of the types in CARD_TYPES
+        (so Wild cards lose any chosen color when they go into a hand), or the
+        card itself if it isn't one of those types.
+
+        Args:
+            card: A Card.
+        """
+        type_id = card.type_id
+        if type_id is None:
+            return card
+        return SHARED_CARDS[type_id]
+
+    def _count(self, card):
+        """
+        Add a card that was just put in the hand to the card type counts and
+        bitmask.
+
+        Args:
+            card: The Card that was added.
+        """
+        card_type = card.card_type
+        if card_type.bit:
+            self._type_counts[card_type.type_id] += 1
+            self._type_mask |= card_type.bit
+        else:
+            self._untyped.append(card)
+
+    @property
+    def type_mask(self):
+        """
+        Return the bitmask of the card types in the hand.
+        """
+        return self._type_mask
+
+    def can_play(self, current_card):
+        """
+        Determine if any card in the hand can be played on the current card,
+        by comparing the hand's bitmask with the current card's playable mask.
+
+        Args:
+            current_card: The Card on top of the discard pile.
+        Returns:
+            True if at least one card matches the current card's color or
+            symbol or is Wild, False if none do.
+        """
+        if self._type_mask & current_card.playable_mask():
+            return True
+        for card in self._untyped:
+            if card.can_play_on(current_card):
+                return True
+        return False
+
+    def playable_cards(self, current_card):
+        """
+        Return the cards in the hand that can be played on the current card,
+        taken straight from the matching buckets.
+
+        Args:
+            current_card: The Card on top of the discard pile.
+        Returns:
+            A list of the Cards matching the current card's color, then the
+            other Cards matching its symbol, then the Wild cards.
+        """
+        color_index = current_card.color_index
+        playable = list(self._by_color[color_index])
+        for card in self._by_symbol[current_card.symbol_index]:
+            if card.card_type.color_index not in (color_index, WILD_INDEX):
+                playable.append(card)
+        if color_index != WILD_INDEX:
+            playable.extend(self._by_color[WILD_INDEX])
+        return playable
+
+    def first_playable(self, current_card):
+        """
+        Return the first card in hand order that can be played on the current
+        card, comparing only the first card of each matching bucket.
+
+        Only those (at most three) cards are checked, but finding which of them
+        comes first searches the hand's list (with list.index), so this takes
+        time proportional to the size of the hand.
+
+        Args:
+            current_card: The Card on top of the discard pile.
+        Returns:
+            The first playable Card, or None if no card can be played.
+        """
+        candidates = [bucket[0] for bucket in (
+            self._by_color[current_card.color_index],
+            self._by_symbol[current_card.symbol_index],
+            self._by_color[WILD_INDEX]) if bucket]
+        if not candidates:
+            return None
+        return min(candidates, key=self._cards.index)
+
+    def type_ids(self):
+        """
+        Return the type ids of the cards in the hand as compact bytes, in hand
+        order.
+        """
+        return bytes([card.type_id for card in self._cards])
+
+    @classmethod
+    def from_type_ids(cls, type_ids):
+        """
+        Create a Hand from the type ids returned by Hand.type_ids().
+
+        Args:
+            type_ids: Bytes (or another iterable of ints) representing the
+                type ids of the cards in hand order.
+        """
+        return cls(cards_from_type_ids(type_ids))
+
+    def __len__(self):
+        """
+        Return the number of cards in the hand.
+        """
+        return len(self._cards)
+
+    def __iter__(self):
+        """
+        Iterate over the cards in hand order.
+        """
+        return iter(self._cards)
+
+    def __getitem__(self, index):
+        """
+        Return the card (or list of cards, for a slice) at the given index.
+        """
+        return self._cards[index]
+
+    def __repr__(self):
+        """
+        Return the cards in the hand, represented like a list.
+        """
+        return repr(self._cards)
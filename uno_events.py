@@ -0,0 +1,77 @@
+"""
+Events describing what happens during an uno game, and the bus that sends them
+to observers.
+"""
+
+from collections import namedtuple
+
+
+# A player played a card onto the discard pile (published before the color of
+# a Wild card is chosen).
+CardPlayed = namedtuple("CardPlayed", ["player", "card"])
+
+# A player drew cards. reason is "+2" or "+4" if an action card made them draw
+# and miss their turn, or None if they couldn't play anything.
+CardsDrawn = namedtuple("CardsDrawn", ["player", "num_cards", "reason"])
+
+# A player was skipped by a "Skip" card.
+PlayerSkipped = namedtuple("PlayerSkipped", ["player"])
+
+# A player chose the color of the Wild card they played.
+ColorChosen = namedtuple("ColorChosen", ["player", "color"])
+
+# A player played their last card and won the game.
+GameWon = namedtuple("GameWon", ["player"])
+
+
+class EventBus:
+    """
+    A representation of a game's event bus, which sends every event published
+    during the game to the registered observers.
+
+    Publishers should check that observers is not empty before creating an
+    event, so that a game without observers doesn't pay for events at all.
+
+    Attributes:
+        observers: A list of callables that take a single event.
+    """
+
+    def __init__(self):
+        """
+        Initialize an event bus with no observers.
+        """
+        self.observers = []
+
+    def subscribe(self, observer):
+        """
+        Register an observer to receive every event published from now on.
+
+        Args:
+            observer: A callable that takes a single event.
+        """
+        self.observers.append(observer)
+
+    def unsubscribe(self, observer):
+        """
+        Stop sending events to an observer.
+
+        Args:
+            observer: A callable that was registered with subscribe().
+        """
+        self.observers.remove(observer)
+
+    def publish(self, event):
+        """
+        Send an event to every observer, in the order they subscribed.
+
+        Args:
+            event: One of the event namedtuples from this module.
+        """
+        for observer in self.observers:
+            observer(event)
+
+    def __repr__(self):
+        """
+        Overwrite the default representation to include the observers.
+        """
+        return f"EventBus with observers: {self.observers}"
@@ -2,7 +2,25 @@
 Classes representing the uno game state and the game director.
 """
 
-from uno_deck import Deck
+import random
+from collections import namedtuple
+from uno_deck import Deck, Hand
+from uno_events import EventBus
+
+
+# A compact copy of a GameState, made by GameState.snapshot(). The piles are
+# bytes of card type ids (see Deck.type_ids()) and top_chosen_color is the
+# chosen color of the current card ("" if it isn't Wild).
+GameSnapshot = namedtuple("GameSnapshot",
+                          ["draw_pile", "discard_pile", "top_chosen_color",
+                           "direction", "current_action", "won",
+                           "reshuffles", "cards_drawn", "actions_resolved"])
+
+# A compact copy of a whole table, made by GameDirector.snapshot(). hands is a
+# tuple with the bytes of card type ids in each player's hand (see
+# Hand.type_ids()).
+TableSnapshot = namedtuple("TableSnapshot",
+                           ["game", "hands", "current_player_index", "turns"])
 
 
 class GameState:
@@ -24,29 +42,51 @@ class GameState:
             etc.)
         won: A bool changed by a player to indicate they they won (True for
             someone has won, False for nobody has declared a win yet.)
+        reshuffles: An int counting how many times the discard pile has been
+            shuffled back into the draw pile.
+        cards_drawn: An int counting the cards drawn from the draw pile
+            (including the deal).
+        actions_resolved: An int counting the action cards whose action has
+            been carried out.
+        rng: A random.Random instance that all of the game's randomness (deck
+            shuffles, bot color choices) comes from.
+        events: An EventBus that players publish what happens during their
+            turns to.
     """
 
-    def __init__(self, def_deck=None):
+    def __init__(self, def_deck=None, seed=None, num_decks=1):
         """
         Initialize an uno gamestate and make the game ready to play.
 
         Args:
             def_deck: (optional) a Deck to be used as the draw deck and not
                 shuffled prior to using (for testing).
+            seed: (optional) A seed for the game's random number generator, so
+                that the game can be replayed exactly. Default is None for an
+                unpredictable game.
+            num_decks: (optional) An int representing the number of full decks
+                to shuffle together into the draw pile (e.g. 4 for a table of
+                20 players), default is 1. Ignored if def_deck is given.
         """
         self._direction = 1
         self.current_action = None
         self.won = False
+        self.reshuffles = 0
+        self.cards_drawn = 0
+        self.actions_resolved = 0
+        self.rng = random.Random(seed)
+        self.events = EventBus()
 
         # Set up the draw pile
         if def_deck is None:
-            self.draw_pile = Deck()
+            self.draw_pile = Deck(rng=self.rng, num_decks=num_decks)
             self.draw_pile.shuffle()
         else:
             self.draw_pile = def_deck
+            self.draw_pile.rng = self.rng
 
         # Set up the discard pile
-        self.discard_pile = Deck(is_empty=True)
+        self.discard_pile = Deck(is_empty=True, rng=self.rng)
         # To set up the discard pile, find the first non-action card, make it
         # the current card (top of discard pile), put all cards before the
         # first non-action card at the bottom of the deck, and shuffle.
@@ -78,28 +118,71 @@ class GameState:
         """
         if self.draw_pile.size() < 5:
             self.reuse_discard_pile()
-        return self.draw_pile.draw(num_cards)
+        cards = self.draw_pile.draw(num_cards)
+        self.cards_drawn += len(cards)
+        return cards
 
     def reuse_discard_pile(self):
         """
         Add the shuffled discard pile cards to the bottom of the draw pile.
+
+        Wild cards are played as shared copies with their chosen color (see
+        Card.with_chosen_color()) and go back to being plain Wild cards when
+        they are drawn into a Hand, so the cards can be moved as they are.
         """
+        # There is nothing to reuse before the first card is played (e.g. when
+        # a small draw pile runs low while the game is set up)
+        if self.discard_pile.size() == 0:
+            return
+        self.reshuffles += 1
+
         # Take off the top/current card in the discard pile
-        top_card = self.discard_pile.draw()
+        top_card = self.discard_pile.draw()[0]
 
-        # Shuffle the remaining cards
+        # Shuffle the remaining cards and put them under the draw pile
         self.discard_pile.shuffle()
+        self.discard_pile.move_under(self.draw_pile)
+
+        # Leave just the top/current card in the discard pile
+        self.discard_pile.add_to_top(top_card)
 
-        # Go through each card in the pile and strip the chosen_color attribute
-        # off the Wild cards
-        useable_cards = self.discard_pile.cards
-        for card in useable_cards:
-            card.strip_chosen_color()
+    def snapshot(self):
+        """
+        Return a compact copy of the game's state that can be restored later.
 
-        # Add the cleaned cards to the bottom of the draw pile
-        self.draw_pile.add_to_bottom(useable_cards)
-        # Replace the original discard pile with just the top/current card
-        self.discard_pile = Deck(def_cards=top_card)
+        The random number generator's state is not included, so a restored
+        game shuffles and chooses colors differently.
+
+        Returns:
+            A GameSnapshot.
+        """
+        return GameSnapshot(self.draw_pile.type_ids(),
+                            self.discard_pile.type_ids(),
+                            self.current_card().chosen_color, self._direction,
+                            self.current_action, self.won, self.reshuffles,
+                            self.cards_drawn, self.actions_resolved)
+
+    def restore(self, snapshot):
+        """
+        Put the game back into the state recorded in a snapshot.
+
+        Args:
+            snapshot: A GameSnapshot from GameState.snapshot() (of this game or
+                of another one).
+        """
+        self.draw_pile = Deck.from_type_ids(snapshot.draw_pile, rng=self.rng)
+        self.discard_pile = Deck.from_type_ids(snapshot.discard_pile,
+                                               rng=self.rng)
+        if snapshot.top_chosen_color:
+            top_card = self.discard_pile.draw()[0]
+            self.discard_pile.add_to_top(
+                top_card.with_chosen_color(snapshot.top_chosen_color))
+        self._direction = snapshot.direction
+        self.current_action = snapshot.current_action
+        self.won = snapshot.won
+        self.reshuffles = snapshot.reshuffles
+        self.cards_drawn = snapshot.cards_drawn
+        self.actions_resolved = snapshot.actions_resolved
 
     def current_card(self):
         """
@@ -158,8 +241,9 @@ class GameDirector:
         players: A list of Player instances (either users or bots).
         game: A GameState instance representing the parts of the game that
             players can interact with.
-        current_player_index: The index in the players list (0-3) of the player
+        current_player_index: The index in the players list of the player
             being/to-be called.
+        turns: An int counting the turns the players have been called for.
     """
 
     def __init__(self, player_list, game_state):
@@ -167,12 +251,18 @@ class GameDirector:
         Initialize the GameDirector instance.
 
         Args:
-            players_list: A list of Player instances (either users or bots).
-            game_state: A GameState instance for the new game.
+            players_list: A list of any number of Player instances (either
+                users or bots), in the order they sit around the table.
+            game_state: A GameState instance for the new game, with enough
+                decks to deal every player in (uno_simulation.setup_game()
+                checks this for headless games).
         """
         self.players = player_list
         self.game = game_state
         self.current_player_index = 0
+        self.turns = 0
+        for player in self.players:
+            player.director = self
 
     def current_player(self):
         """
@@ -189,6 +279,7 @@ class GameDirector:
         if self.game.current_action == "Reverse":
             self.game.reverse_direction()
             self.game.current_action = None
+            self.game.actions_resolved += 1
 
     def call_the_player(self):
         """
@@ -196,20 +287,44 @@ class GameDirector:
         them like drawing card or being skipped, and if they don't have to do
         that, then play a card of their choice).
         """
+        self.turns += 1
         self.current_player().take_turn()
 
+    def snapshot(self):
+        """
+        Return a compact copy of the game, every player's hand and whose turn
+        it is, that can be restored later.
+
+        Returns:
+            A TableSnapshot.
+        """
+        return TableSnapshot(self.game.snapshot(),
+                             tuple(player.hand.type_ids()
+                                   for player in self.players),
+                             self.current_player_index, self.turns)
+
+    def restore(self, snapshot):
+        """
+        Put the game and the players' hands back into the state recorded in a
+        snapshot.
+
+        Args:
+            snapshot: A TableSnapshot from GameDirector.snapshot() of a table
+                with the same number of players.
+        """
+        self.game.restore(snapshot.game)
+        for player, hand in zip(self.players, snapshot.hands):
+            player.hand = Hand.from_type_ids(hand)
+        self.current_player_index = snapshot.current_player_index
+        self.turns = snapshot.turns
+
     def go_to_next_player(self):
         """
         Change current_player_index to the correct next int using the game's
-        direction and loop at the bounds of the list.
+        direction, wrapping around the table.
         """
-        new_index = self.current_player_index + self.game.direction
-        if new_index > len(self.players)-1:
-            self.current_player_index = 0
-        elif new_index < 0:
-            self.current_player_index = len(self.players)-1
-        else:
-            self.current_player_index = new_index
+        self.current_player_index = ((self.current_player_index +
+                                      self.game.direction) % len(self.players))
 
     def __repr__(self):
         """
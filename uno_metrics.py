@@ -0,0 +1,240 @@
+"""
+Counters for long runs of headless uno games, and an exporter that writes them
+to a file in the Prometheus text format or as JSON lines.
+"""
+
+import json
+import os
+import time
+
+# The counters kept by MetricsCollector, in the order they are exported, and
+# the help text for each of them
+COUNTERS = {
+    "games": "Games finished (or given up on).",
+    "turns": "Turns the players were called for.",
+    "cards_drawn": "Cards drawn from the draw pile, including the deal.",
+    "reshuffles": "Times the discard pile was reused as the draw pile.",
+    "actions_resolved": "Action cards whose action was carried out.",
+}
+
+
+class MetricsCollector:
+    """
+    A representation of the running totals of a campaign of games, added up
+    from each game's GameState and GameDirector counters when it ends.
+
+    Attributes:
+        games: An int counting the games added.
+        turns: An int counting the turns of those games.
+        cards_drawn: An int counting the cards drawn in those games.
+        reshuffles: An int counting the reshuffles in those games.
+        actions_resolved: An int counting the actions resolved in those games.
+        longest_game: An int representing the most turns any game took.
+        exporter: A MetricsExporter given the chance to export after every
+            game, or None.
+    """
+
+    def __init__(self, exporter=None):
+        """
+        Initialize a collector with every counter at 0.
+
+        Args:
+            exporter: (optional) A MetricsExporter to give the chance to export
+                after every game, or None (default).
+        """
+        self.games = 0
+        self.turns = 0
+        self.cards_drawn = 0
+        self.reshuffles = 0
+        self.actions_resolved = 0
+        self.longest_game = 0
+        self.exporter = exporter
+
+    def add_game(self, director):
+        """
+        Add the counters of a game that has ended to the totals.
+
+        Args:
+            director: The GameDirector of the game.
+        """
+        game = director.game
+        self.games += 1
+        self.turns += director.turns
+        self.cards_drawn += game.cards_drawn
+        self.reshuffles += game.reshuffles
+        self.actions_resolved += game.actions_resolved
+        if director.turns > self.longest_game:
+            self.longest_game = director.turns
+        if self.exporter is not None:
+            self.exporter.maybe_export(self)
+
+    def flush(self):
+        """
+        Have the exporter write any games added since its last export (e.g.
+        when a campaign ends partway through an interval).
+        """
+        if self.exporter is not None:
+            self.exporter.flush(self)
+
+    def totals(self):
+        """
+        Return the counters and the longest game as a dict.
+        """
+        return {"games": self.games, "turns": self.turns,
+                "cards_drawn": self.cards_drawn, "reshuffles": self.reshuffles,
+                "actions_resolved": self.actions_resolved,
+                "longest_game": self.longest_game}
+
+    def __repr__(self):
+        """
+        Return the collector's totals, overwriting the default representation
+        of MetricsCollector.
+        """
+        return f"{self.__class__.__name__} with totals: {self.totals()}"
+
+
+class MetricsExporter:
+    """
+    A representation of an exporter that writes a collector's totals to a
+    local file at most once per interval, along with the rates since the last
+    export (e.g. to spot reshuffle storms while a campaign is running).
+
+    In "prometheus" format the file is replaced with the latest metrics each
+    time (for a node exporter's textfile collector, for example). In "jsonl"
+    format one JSON object is appended per export.
+
+    Attributes:
+        path: A string representing the file to write to.
+        file_format: A string, either "prometheus" or "jsonl".
+        interval: A float representing the minimum number of seconds between
+            exports.
+        clock: A function returning the current time in seconds.
+        _last_time: The clock time of the last export (or of the exporter's
+            creation).
+        _last_totals: The totals at the last export.
+    """
+
+    def __init__(self, path, file_format="prometheus", interval=10.0,
+                 clock=time.monotonic):
+        """
+        Initialize an exporter.
+
+        Args:
+            path: A string representing the file to write to.
+            file_format: (optional) A string, either "prometheus" (default) or
+                "jsonl".
+            interval: (optional) A float representing the minimum number of
+                seconds between exports, default is 10.
+            clock: (optional) A function returning the current time in
+                seconds, default is time.monotonic.
+        Raises:
+            ValueError: If the file_format isn't "prometheus" or "jsonl".
+        """
+        if file_format not in ("prometheus", "jsonl"):
+            raise ValueError(f"Unknown metrics format: {file_format!r}")
+        self.path = path
+        self.file_format = file_format
+        self.interval = interval
+        self.clock = clock
+        self._last_time = clock()
+        self._last_totals = dict.fromkeys(COUNTERS, 0)
+
+    def maybe_export(self, collector):
+        """
+        Export the collector's totals if the interval has passed since the last
+        export.
+
+        Args:
+            collector: A MetricsCollector.
+        Returns:
+            True if the totals were exported, False if not.
+        """
+        if self.clock() - self._last_time < self.interval:
+            return False
+        self.export(collector)
+        return True
+
+    def flush(self, collector):
+        """
+        Export the collector's totals now if any games were added since the
+        last export, whether or not the interval has passed.
+
+        Args:
+            collector: A MetricsCollector.
+        Returns:
+            True if the totals were exported, False if not.
+        """
+        if collector.games == self._last_totals["games"]:
+            return False
+        self.export(collector)
+        return True
+
+    def export(self, collector):
+        """
+        Write the collector's totals and the rates since the last export to
+        the file now.
+
+        Args:
+            collector: A MetricsCollector.
+        """
+        now = self.clock()
+        totals = collector.totals()
+        elapsed = now - self._last_time
+        new_games = totals["games"] - self._last_totals["games"]
+        rates = {
+            "turns_per_second": ((totals["turns"] - self._last_totals["turns"])
+                                 / elapsed if elapsed > 0 else 0.0),
+            "games_per_second": new_games / elapsed if elapsed > 0 else 0.0,
+            "reshuffles_per_game": ((totals["reshuffles"] -
+                                     self._last_totals["reshuffles"])
+                                    / new_games if new_games else 0.0),
+        }
+        if self.file_format == "prometheus":
+            self.write_prometheus(totals, rates)
+        else:
+            self.write_json_line(totals, rates)
+        self._last_time = now
+        self._last_totals = totals
+
+    def write_prometheus(self, totals, rates):
+        """
+        Replace the file with the metrics in the Prometheus text format.
+
+        Args:
+            totals: A dict from MetricsCollector.totals().
+            rates: A dict of the rates since the last export.
+        """
+        lines = []
+        for name, help_text in COUNTERS.items():
+            lines += [f"# HELP uno_{name}_total {help_text}",
+                      f"# TYPE uno_{name}_total counter",
+                      f"uno_{name}_total {totals[name]}"]
+        gauges = dict(rates, longest_game=totals["longest_game"])
+        for name, value in gauges.items():
+            lines += [f"# TYPE uno_{name} gauge", f"uno_{name} {value}"]
+
+        # Write to a temporary file first so readers never see half a file
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(temporary_path, self.path)
+
+    def write_json_line(self, totals, rates):
+        """
+        Append the metrics to the file as one line of JSON.
+
+        Args:
+            totals: A dict from MetricsCollector.totals().
+            rates: A dict of the rates since the last export.
+        """
+        record = dict(totals, **rates, time=time.time())
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+
+    def __repr__(self):
+        """
+        Return the format and path the exporter writes, overwriting the
+        default representation of MetricsExporter.
+        """
+        return f"{self.__class__.__name__} writing {self.file_format} to: " \
+            f"{self.path}"
@@ -0,0 +1,91 @@
+"""
+A deadline-based scheduler for pacing interactive uno games.
+"""
+
+import asyncio
+import time
+from uno_events import CardPlayed
+
+
+class TurnPacer:
+    """
+    A representation of the pacing of an interactive game, which holds the
+    next turn back until the player who last played a card has waited their
+    play_card_delay.
+
+    The pacer subscribes to the game's events and only records a deadline, so
+    the players never block. The driver loop decides how to wait for it: with
+    wait() in a plain loop, with wait_async() in an asyncio task (so many
+    tables can share one thread), or by polling remaining(). Time spent between
+    the play and the wait (e.g. drawing the view) counts towards the delay.
+
+    Attributes:
+        clock: A function returning the current time in seconds.
+        deadline: A float representing the clock time the next turn can start
+            at, or None if it can start right away.
+    """
+
+    def __init__(self, game_state=None, clock=time.monotonic):
+        """
+        Initialize a pacer, optionally subscribing it to a game's events.
+
+        Args:
+            game_state: (optional) A GameState instance whose events should be
+                paced, or None (default) to subscribe the pacer later.
+            clock: (optional) A function returning the current time in
+                seconds, default is time.monotonic.
+        """
+        self.clock = clock
+        self.deadline = None
+        if game_state is not None:
+            game_state.events.subscribe(self)
+
+    def __call__(self, event):
+        """
+        Push the deadline back when a player with a delay plays a card.
+
+        Args:
+            event: One of the event namedtuples from uno_events.
+        """
+        if isinstance(event, CardPlayed):
+            delay = event.player.play_card_delay
+            if delay:
+                self.deadline = self.clock() + delay
+
+    def remaining(self):
+        """
+        Return the number of seconds until the next turn can start (0 if it
+        can start now).
+        """
+        if self.deadline is None:
+            return 0
+        remaining = self.deadline - self.clock()
+        if remaining <= 0:
+            self.deadline = None
+            return 0
+        return remaining
+
+    def wait(self):
+        """
+        Block until the next turn can start.
+        """
+        remaining = self.remaining()
+        if remaining > 0:
+            time.sleep(remaining)
+        self.deadline = None
+
+    async def wait_async(self):
+        """
+        Wait without blocking the event loop until the next turn can start.
+        """
+        remaining = self.remaining()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        self.deadline = None
+
+    def __repr__(self):
+        """
+        Return the pacer's deadline, overwriting the default representation of
+        TurnPacer.
+        """
+        return f"{self.__class__.__name__} with deadline: {self.deadline}"
@@ -0,0 +1,365 @@
+"""
+Opt-in hooks for timing the phases of uno turns, summarized as histograms or
+exported as a Chrome trace.
+
+The hooks replace methods on individual instances (a view, a director and its
+players, a pacer) with timed wrappers, so games that aren't profiled don't pay
+anything for them.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# The methods timed by TurnProfiler.instrument_view(), instrument_director(),
+# instrument_player() and instrument_pacer(), which are also the names of their
+# phases unless TurnProfiler.phase_names renames them
+VIEW_PHASES = ("display",)
+DIRECTOR_PHASES = ("call_the_player", "handle_reverse", "go_to_next_player")
+PLAYER_PHASES = ("handle_action", "can_play", "choose_card", "draw")
+PACER_PHASES = ("wait",)
+
+
+class PhaseHistogram:
+    """
+    A histogram of the durations of one phase, with buckets for each power of
+    two nanoseconds.
+
+    Attributes:
+        buckets: A list of ints where bucket i counts the durations with
+            i bits (so between 2**(i-1) and 2**i - 1 nanoseconds).
+        count: An int representing the number of durations recorded.
+        total_ns: An int representing the sum of the durations.
+        min_ns: An int representing the shortest duration, or None.
+        max_ns: An int representing the longest duration, or None.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty histogram.
+        """
+        self.buckets = [0] * 65
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = None
+
+    def record(self, duration_ns):
+        """
+        Add a duration to the histogram.
+
+        Args:
+            duration_ns: An int representing a duration in nanoseconds.
+        """
+        self.buckets[min(duration_ns.bit_length(), 64)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if self.min_ns is None or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if self.max_ns is None or duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def mean_ns(self):
+        """
+        Return the mean duration in nanoseconds (0 if nothing was recorded).
+        """
+        if self.count == 0:
+            return 0
+        return self.total_ns / self.count
+
+    def percentile_ns(self, percent):
+        """
+        Return an upper bound for a percentile of the durations, from the
+        histogram buckets.
+
+        Args:
+            percent: A float between 0 and 100.
+        Returns:
+            An int representing the top of the bucket the percentile falls in
+            (capped at the longest duration), or 0 if nothing was recorded.
+        """
+        if self.count == 0:
+            return 0
+        target = self.count * percent / 100
+        seen = 0
+        for bits, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if bucket_count and seen >= target:
+                return min((1 << bits) - 1, self.max_ns)
+        return self.max_ns
+
+    def __repr__(self):
+        """
+        Return the number of durations in the histogram and their mean,
+        overwriting the default representation of PhaseHistogram.
+        """
+        return f"{self.__class__.__name__} with {self.count} durations " \
+            f"averaging {self.mean_ns():.0f} ns"
+
+
+class TurnProfiler:
+    """
+    A representation of a profiler that times the phases of each turn (like
+    displaying the view, a player choosing a card or drawing) into one
+    PhaseHistogram per phase.
+
+    Nothing is timed until instances are instrumented, and remove() puts their
+    original methods back.
+
+    Attributes:
+        phase_names: A class attribute mapping method names to the names of
+            the phases they are recorded as, for methods whose phase isn't
+            named after them.
+        histograms: A dict from phase names to PhaseHistograms.
+        clock: A function returning the current time in integer nanoseconds.
+        _wrapped: A list of (instance, method name, wrapper) tuples for the
+            methods that have been replaced with timed wrappers.
+    """
+    phase_names = {"wait": "pacer_wait"}
+
+    def __init__(self, clock=time.perf_counter_ns):
+        """
+        Initialize a profiler that hasn't instrumented anything yet.
+
+        Args:
+            clock: (optional) A function returning the current time in integer
+                nanoseconds, default is time.perf_counter_ns.
+        """
+        self.histograms = {}
+        self.clock = clock
+        self._wrapped = []
+
+    def record(self, phase, start_ns, end_ns):
+        """
+        Record one call of a phase. Subclasses can override this to record
+        the calls some other way.
+
+        Args:
+            phase: A string representing the name of the phase.
+            start_ns: An int representing when the call started.
+            end_ns: An int representing when the call ended.
+        """
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = PhaseHistogram()
+        histogram.record(end_ns - start_ns)
+
+    @contextmanager
+    def span(self, phase):
+        """
+        Time the code run inside a with block as one call of a phase (e.g. a
+        whole "turn" of the loop running the game, around the phases of the
+        instrumented methods it calls).
+
+        Args:
+            phase: A string representing the name of the phase.
+        """
+        start_ns = self.clock()
+        try:
+            yield
+        finally:
+            self.record(phase, start_ns, self.clock())
+
+    def wrap(self, instance, method_name, phase=None):
+        """
+        Replace a method of one instance with a wrapper that times each call.
+
+        Args:
+            instance: The object whose method should be timed.
+            method_name: A string representing the name of the method.
+            phase: (optional) A string representing the name of the phase to
+                record the calls as, default is the method's name in
+                phase_names or else the method name.
+        """
+        if phase is None:
+            phase = self.phase_names.get(method_name, method_name)
+        clock = self.clock
+        record = self.record
+
+        def timed(*args, **kwargs):
+            start_ns = clock()
+            try:
+                return timed.method(*args, **kwargs)
+            finally:
+                record(phase, start_ns, clock())
+
+        # Keep the method being wrapped and whatever instance attribute it
+        # replaces (e.g. another profiler's wrapper, or None), so that
+        # remove() can put it back
+        timed.method = getattr(instance, method_name)
+        timed.previous = vars(instance).get(method_name)
+        setattr(instance, method_name, timed)
+        self._wrapped.append((instance, method_name, timed))
+
+    def instrument_view(self, view):
+        """
+        Time a view's display() calls.
+
+        Args:
+            view: An UnoView instance.
+        """
+        for method_name in VIEW_PHASES:
+            self.wrap(view, method_name)
+
+    def instrument_pacer(self, pacer):
+        """
+        Time how long a pacer holds each turn back (as "pacer_wait").
+
+        Args:
+            pacer: A TurnPacer instance.
+        """
+        for method_name in PACER_PHASES:
+            self.wrap(pacer, method_name)
+
+    def instrument_player(self, player):
+        """
+        Time the steps of a player's turns: handling actions, checking if they
+        can play, choosing a card and drawing.
+
+        Args:
+            player: A Player instance.
+        """
+        for method_name in PLAYER_PHASES:
+            self.wrap(player, method_name)
+
+    def instrument_director(self, director):
+        """
+        Time the phases of a director's turn cycle, and the turns of each of
+        its players.
+
+        Args:
+            director: A GameDirector instance.
+        """
+        for method_name in DIRECTOR_PHASES:
+            self.wrap(director, method_name)
+        for player in director.players:
+            self.instrument_player(player)
+
+    def remove(self):
+        """
+        Put back the original methods of everything that was instrumented,
+        leaving any other profiler's wrappers of the same methods in place.
+        """
+        for instance, method_name, timed in reversed(self._wrapped):
+            outer = vars(instance).get(method_name)
+            if outer is timed:
+                if timed.previous is None:
+                    delattr(instance, method_name)
+                else:
+                    setattr(instance, method_name, timed.previous)
+                continue
+            # Another profiler wrapped the method after this one, so take this
+            # wrapper out from under the ones wrapping it
+            while outer is not None and \
+                    getattr(outer, "previous", None) is not timed:
+                outer = getattr(outer, "previous", None)
+            if outer is not None:
+                outer.method = timed.method
+                outer.previous = timed.previous
+        self._wrapped = []
+
+    def report(self):
+        """
+        Return a table of the phases, with the number of calls, the mean,
+        median, 99th percentile and longest durations, and each phase's total
+        time.
+
+        Returns:
+            A string.
+        """
+        lines = [f"{'phase':<18}{'calls':>8}{'mean us':>10}{'p50 us':>10}"
+                 f"{'p99 us':>10}{'max us':>10}{'total ms':>10}"]
+        for phase, histogram in sorted(self.histograms.items(),
+                                       key=lambda item: -item[1].total_ns):
+            lines.append(f"{phase:<18}{histogram.count:>8}"
+                         f"{histogram.mean_ns() / 1e3:>10.1f}"
+                         f"{histogram.percentile_ns(50) / 1e3:>10.1f}"
+                         f"{histogram.percentile_ns(99) / 1e3:>10.1f}"
+                         f"{histogram.max_ns / 1e3:>10.1f}"
+                         f"{histogram.total_ns / 1e6:>10.1f}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        """
+        Return the names of the phases the profiler has recorded, overwriting
+        the default representation of TurnProfiler.
+        """
+        return f"{self.__class__.__name__} with phases: " \
+            f"{sorted(self.histograms)}"
+
+
+class ChromeTracer(TurnProfiler):
+    """
+    A representation of a tracer that records every timed call as a span in
+    the Chrome trace event format, which trace viewers (like Perfetto or
+    chrome://tracing) can show as a timeline.
+
+    The loop running the game records each turn as a "turn" span (see
+    TurnProfiler.span()), with the pacer_wait, display, call_the_player,
+    handle_reverse and go_to_next_player spans nested in it, and the player's
+    handle_action, can_play, choose_card and draw calls nested in
+    call_the_player.
+
+    Attributes:
+        events: A list of trace event dicts.
+        pid: An int representing the process id to record the spans under.
+        tid: An int representing the thread id to record the spans under.
+        origin_ns: An int representing the clock time that the trace's
+            timestamps start from.
+    """
+    def __init__(self, clock=time.perf_counter_ns, pid=None, tid=0):
+        """
+        Initialize a tracer with no events.
+
+        Args:
+            clock: (optional) A function returning the current time in integer
+                nanoseconds, default is time.perf_counter_ns.
+            pid: (optional) An int representing the process id to record the
+                spans under, default is this process's id.
+            tid: (optional) An int representing the thread id to record the
+                spans under, default is 0.
+        """
+        super().__init__(clock)
+        self.events = []
+        self.pid = os.getpid() if pid is None else pid
+        self.tid = tid
+        self.origin_ns = clock()
+
+    def record(self, phase, start_ns, end_ns):
+        """
+        Record one call of a phase as a complete ("X") trace event, with times
+        in microseconds.
+
+        Args:
+            phase: A string representing the name of the phase.
+            start_ns: An int representing when the call started.
+            end_ns: An int representing when the call ended.
+        """
+        self.events.append({"name": phase, "cat": "uno", "ph": "X",
+                            "ts": (start_ns - self.origin_ns) / 1e3,
+                            "dur": (end_ns - start_ns) / 1e3,
+                            "pid": self.pid, "tid": self.tid})
+
+    def trace(self):
+        """
+        Return the trace as a dict in the Chrome trace event format.
+        """
+        return {"traceEvents": self.events, "displayTimeUnit": "ns"}
+
+    def write(self, path):
+        """
+        Write the trace to a JSON file that a trace viewer can load.
+
+        Args:
+            path: A string representing the file to write to.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.trace(), file)
+
+    def __repr__(self):
+        """
+        Return the number of trace events the tracer has recorded, overwriting
+        the default representation of ChromeTracer.
+        """
+        return f"{self.__class__.__name__} with {len(self.events)} events"
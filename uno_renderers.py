@@ -0,0 +1,207 @@
+"""
+Classes that write the frames built by the uno views to the terminal.
+"""
+
+import re
+import shutil
+import sys
+import unicodedata
+from functools import lru_cache
+
+# ANSI escape codes used to redraw parts of the screen
+CLEAR_SCREEN = "\033[2J"
+CLEAR_LINE_END = "\033[K"
+CLEAR_SCREEN_END = "\033[J"
+
+# Matches the ANSI escape codes (like the card colors) that take up no columns
+ESCAPE_CODE = re.compile("\033\\[[0-9;]*[A-Za-z]")
+
+
+def move_cursor(row):
+    """
+    Return the ANSI escape code moving the cursor to the start of a row.
+
+    Args:
+        row: An int representing the screen row to move to, starting at 0.
+    Returns:
+        A string.
+    """
+    return f"\033[{row + 1};1H"
+
+
+@lru_cache(maxsize=1024)
+def display_width(text):
+    """
+    Return the number of terminal columns a row takes up.
+
+    ANSI escape codes take up no columns, and wide characters (like the
+    full-width digits on the hand cards) take up two.
+
+    Args:
+        text: A string without line breaks.
+    Returns:
+        An int.
+    """
+    return sum(2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+               for char in ESCAPE_CODE.sub("", text))
+
+
+class StreamRenderer:
+    """
+    A renderer that writes every frame below the previous one, like printing
+    it, with a single write per frame.
+
+    Attributes:
+        stream: A file-like object to write to, or None to write to whatever
+            sys.stdout is when the frame is rendered.
+        terminal_size: A function returning the terminal's size as an
+            os.terminal_size (with columns and lines).
+    """
+
+    def __init__(self, stream=None, terminal_size=shutil.get_terminal_size):
+        """
+        Initialize a renderer writing to a stream.
+
+        Args:
+            stream: (optional) A file-like object to write to, or None
+                (default) for sys.stdout.
+            terminal_size: (optional) A function returning the terminal's
+                size, default is shutil.get_terminal_size.
+        """
+        self.stream = stream
+        self.terminal_size = terminal_size
+
+    def columns(self):
+        """
+        Return the number of columns the terminal has, so views can fit their
+        rows to it.
+        """
+        return self.terminal_size().columns
+
+    def render(self, rows):
+        """
+        Write a frame.
+
+        Args:
+            rows: A list of strings, each written on its own line.
+        Returns:
+            The string that was written.
+        """
+        text = "\n".join(rows) + "\n"
+        self.write(text)
+        return text
+
+    def invalidate(self):
+        """
+        Forget what is on the screen. Every frame is written in full, so there
+        is nothing to forget.
+        """
+
+    def write(self, text):
+        """
+        Write text to the stream in one write, and flush it.
+
+        Args:
+            text: A string to write.
+        """
+        stream = sys.stdout if self.stream is None else self.stream
+        stream.write(text)
+        stream.flush()
+
+    def __repr__(self):
+        """
+        Return the stream the renderer writes to, overwriting the default
+        representation of StreamRenderer.
+        """
+        return f"{self.__class__.__name__} writing to: {self.stream}"
+
+
+class DiffRenderer(StreamRenderer):
+    """
+    A full-screen renderer that keeps the last frame drawn at the top of the
+    screen and uses ANSI cursor moves to only rewrite the rows that changed
+    (e.g. a card count in the player ring, the current card or the hand).
+
+    Each row of a frame is drawn on its own screen row, so a frame with a row
+    wider than the terminal, or with more rows than fit above the prompt, is
+    drawn in full (and the next frame is too) instead.
+
+    Anything written after a frame (like an input prompt) shows up below it,
+    and is cleared when the next frame is rendered. Whatever writes it must
+    call invalidate() if it could have scrolled the terminal.
+
+    Attributes:
+        stream: A file-like object to write to, or None to write to whatever
+            sys.stdout is when the frame is rendered.
+        terminal_size: A function returning the terminal's size as an
+            os.terminal_size (with columns and lines).
+        last_rows: The list of rows on the screen, or None if the whole screen
+            should be redrawn next time.
+    """
+
+    def __init__(self, stream=None, terminal_size=shutil.get_terminal_size):
+        """
+        Initialize a renderer that will clear the screen before its first
+        frame.
+
+        Args:
+            stream: (optional) A file-like object to write to, or None
+                (default) for sys.stdout.
+            terminal_size: (optional) A function returning the terminal's
+                size, default is shutil.get_terminal_size.
+        """
+        super().__init__(stream, terminal_size)
+        self.last_rows = None
+
+    def fits(self, rows):
+        """
+        Return whether a frame fits on the screen with two rows to spare below
+        it (for an input prompt and the new line the user's Enter adds), with
+        none of its rows wrapping.
+
+        Args:
+            rows: A list of strings, each drawn on its own row.
+        """
+        size = self.terminal_size()
+        return len(rows) + 2 <= size.lines and all(
+            display_width(row) <= size.columns for row in rows)
+
+    def invalidate(self):
+        """
+        Forget what is on the screen, so the next frame is drawn in full (e.g.
+        after an input prompt or a message scrolled the terminal).
+        """
+        self.last_rows = None
+
+    def render(self, rows):
+        """
+        Rewrite the rows of the screen that differ from the new frame, clear
+        anything below it, and leave the cursor on the row after it.
+
+        Args:
+            rows: A list of strings, each drawn on its own row.
+        Returns:
+            The string that was written.
+        """
+        if not self.fits(rows):
+            # The frame's rows can't be found by their index on the screen, so
+            # draw it all (which scrolls the terminal) and start over next time
+            text = CLEAR_SCREEN + move_cursor(0) + "\n".join(rows) + "\n"
+            self.last_rows = None
+            self.write(text)
+            return text
+
+        parts = []
+        last_rows = self.last_rows
+        if last_rows is None:
+            parts.append(CLEAR_SCREEN)
+            last_rows = []
+        for row_num, row in enumerate(rows):
+            if row_num >= len(last_rows) or last_rows[row_num] != row:
+                parts.append(move_cursor(row_num) + row + CLEAR_LINE_END)
+        parts.append(move_cursor(len(rows)) + CLEAR_SCREEN_END)
+        self.last_rows = list(rows)
+
+        text = "".join(parts)
+        self.write(text)
+        return text
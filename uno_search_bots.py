@@ -0,0 +1,521 @@
+"""
+Computer uno players that choose their cards by playing headless rollouts of
+the rest of the game.
+"""
+
+import math
+import os
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from uno_controllers import Player, BotPlayer
+from uno_deck import COLORS
+from uno_events import ColorChosen
+from uno_game import GameState
+from uno_simulation import setup_game, run_game, decks_needed
+
+
+class RolloutPlayer(BotPlayer):
+    """
+    A bot player used inside rollouts, which plays like a BotPlayer but can be
+    told which color to choose for a Wild card.
+    """
+
+    def choose_color(self, card, manual_input=None):
+        """
+        Choose the color of a Wild card.
+
+        Args:
+            card: A "Wild" colored Card instance whose color should be chosen.
+            manual_input: (optional) A string representing the color to choose
+                (e.g. "Red"), or None (default) to choose randomly like a
+                BotPlayer.
+        Returns:
+            A copy of the card with the player's choice as its chosen_color.
+        """
+        if manual_input is None:
+            return super().choose_color(card)
+        return card.with_chosen_color(manual_input)
+
+
+def list_moves(hand, current_card):
+    """
+    Return the distinct moves a player can make with their hand.
+
+    Args:
+        hand: A Hand instance.
+        current_card: The Card on top of the discard pile.
+    Returns:
+        A list of (type_id, color) tuples, with one move for each playable
+        card type and, for Wild cards, each color that could be chosen (color
+        is None for other cards).
+    """
+    moves = []
+    seen_types = set()
+    for card in hand.playable_cards(current_card):
+        if card.type_id in seen_types:
+            continue
+        seen_types.add(card.type_id)
+        if card.is_wild():
+            moves.extend((card.type_id, color) for color in COLORS[:4])
+        else:
+            moves.append((card.type_id, None))
+    return moves
+
+
+def determinize(snapshot, seat, rng):
+    """
+    Return a copy of a table snapshot with the cards the seated player can't
+    see (the draw pile and the other players' hands) shuffled and dealt again,
+    keeping the size of every hand.
+
+    Args:
+        snapshot: A TableSnapshot from GameDirector.snapshot().
+        seat: An int representing the index of the player whose point of view
+            the snapshot is seen from.
+        rng: A random.Random instance to shuffle the hidden cards with.
+    Returns:
+        A TableSnapshot.
+    """
+    draw_size = len(snapshot.game.draw_pile)
+    hidden = bytearray(snapshot.game.draw_pile)
+    for index, hand in enumerate(snapshot.hands):
+        if index != seat:
+            hidden += hand
+    rng.shuffle(hidden)
+
+    hands = []
+    dealt = draw_size
+    for index, hand in enumerate(snapshot.hands):
+        if index == seat:
+            hands.append(hand)
+        else:
+            hands.append(bytes(hidden[dealt:dealt + len(hand)]))
+            dealt += len(hand)
+    game = snapshot.game._replace(draw_pile=bytes(hidden[:draw_size]))
+    return snapshot._replace(game=game, hands=tuple(hands))
+
+
+def play_rollout(director, snapshot, seat, move, max_turns=None):
+    """
+    Restore a headless table to a snapshot, have the seated player make a move
+    and play the rest of the game out.
+
+    Args:
+        director: A GameDirector instance for a headless table of
+            RolloutPlayers.
+        snapshot: A TableSnapshot taken during the seated player's turn, after
+            they have handled any actions.
+        seat: An int representing the index of the player making the move.
+        move: A (type_id, color) tuple from list_moves().
+        max_turns: (optional) An int limiting the number of turns to play
+            after the move, or None (default) to play until someone wins.
+    Returns:
+        True if the seated player won the game, False otherwise.
+    """
+    director.restore(snapshot)
+    player = director.players[seat]
+    type_id, color = move
+    for card in player.hand:
+        if card.type_id == type_id:
+            player.play_card(card, choose_manual_input=color)
+            break
+    if player.num_cards() == 0:
+        return True
+    director.handle_reverse()
+    director.go_to_next_player()
+    run_game(director, max_turns)
+    return director.game.won and director.current_player_index == seat
+
+
+def make_rollout_director(num_players, seed=None):
+    """
+    Return a new headless table of RolloutPlayers to play rollouts on.
+
+    Args:
+        num_players: An int representing the number of players at the table.
+        seed: (optional) A seed for the table's random number generator.
+    """
+    return setup_game([RolloutPlayer] * num_players,
+                      GameState(seed=seed,
+                                num_decks=decks_needed(num_players)))
+
+
+def select_move(wins, visits, total, exploration):
+    """
+    Pick the next move to try with the UCB1 rule, trying every move once
+    first.
+
+    Args:
+        wins: A list of the number of rollouts won after each move.
+        visits: A list of the number of rollouts played after each move.
+        total: An int representing the total number of rollouts played.
+        exploration: A float representing the UCB1 exploration constant.
+    Returns:
+        An int representing the index of the move to try.
+    """
+    for index, count in enumerate(visits):
+        if count == 0:
+            return index
+    log_total = math.log(total)
+    return max(range(len(visits)), key=lambda index: (
+        wins[index] / visits[index] +
+        exploration * math.sqrt(log_total / visits[index])))
+
+
+def run_search(director, root, seat, moves, rng, time_budget, max_rollouts,
+               rollout_max_turns, exploration, first_moves=None):
+    """
+    Play determinized rollouts of a table until the budget runs out, trying
+    some moves (by default every move) at least once first.
+
+    Args:
+        director: A GameDirector instance for a headless table of
+            RolloutPlayers with the same number of players as the root.
+        root: A TableSnapshot taken during the seated player's turn.
+        seat: An int representing the index of the player searching.
+        moves: A list of (type_id, color) tuples from list_moves().
+        rng: A random.Random instance for determinizing and choosing colors.
+        time_budget: A float representing the number of seconds to search for,
+            or None for no time limit.
+        max_rollouts: An int representing the number of rollouts to play, or
+            None for no limit.
+        rollout_max_turns: An int limiting the number of turns of each
+            rollout.
+        exploration: A float representing the UCB1 exploration constant.
+        first_moves: (optional) A list of the indices in moves of the moves
+            to try once each before the budget applies, default is every
+            move.
+    Returns:
+        A tuple (wins, visits) of lists with the number of rollouts won and
+        played after each move.
+    """
+    if first_moves is None:
+        first_moves = range(len(moves))
+    wins = [0] * len(moves)
+    visits = [0] * len(moves)
+    deadline = None
+    if time_budget is not None:
+        deadline = time.perf_counter() + time_budget
+    rollouts = 0
+    while rollouts < len(first_moves) or (
+            (max_rollouts is None or rollouts < max_rollouts) and
+            (deadline is None or time.perf_counter() < deadline)):
+        if rollouts < len(first_moves):
+            index = first_moves[rollouts]
+        else:
+            index = select_move(wins, visits, rollouts, exploration)
+        wins[index] += play_rollout(director, determinize(root, seat, rng),
+                                    seat, moves[index], rollout_max_turns)
+        visits[index] += 1
+        rollouts += 1
+    return wins, visits
+
+
+class MCTSBotPlayer(Player):
+    """
+    A bot player that chooses its cards with Monte Carlo search.
+
+    For each decision, the bot repeatedly deals the cards it can't see at
+    random (a determinization), picks one of its moves with the UCB1 rule and
+    plays the rest of the game out with simple bots, until its time or
+    rollout budget runs out. It then plays the move it tried the most.
+
+    Attributes:
+        time_budget: A float representing the number of seconds the bot can
+            spend searching per decision, or None for no time limit.
+        max_rollouts: An int representing the number of rollouts the bot can
+            play per decision, or None for no limit.
+        rollout_max_turns: An int limiting the number of turns of each
+            rollout.
+        exploration: A class attribute representing the UCB1 exploration
+            constant.
+        last_search: A list of (move, wins, visits) tuples from the most
+            recent search.
+        _planned_color: A string representing the color to choose for the Wild
+            card being played, or None.
+        _rollout_director: The GameDirector of the headless table used for
+            rollouts (created the first time the bot searches).
+    """
+    player_type = "Bot"
+    default_delay = 1
+    exploration = math.sqrt(2)
+
+    def __init__(self, game_state, player_name, play_card_delay=None,
+                 time_budget=0.2, max_rollouts=None,
+                 rollout_max_turns=1000):
+        """
+        Initialize an MCTSBotPlayer instance.
+
+        Args:
+            game_state: A GameState instance representing the uno game the
+                player is in.
+            player_name: A string representing the player's name.
+            play_card_delay: (optional) A float representing the number of
+                seconds the player should wait after playing their card.
+            time_budget: (optional) A float representing the number of seconds
+                to search per decision, default is 0.2. None means no time
+                limit.
+            max_rollouts: (optional) An int representing the number of
+                rollouts to play per decision, default is None for no limit.
+            rollout_max_turns: (optional) An int limiting the number of turns
+                of each rollout, default is 1000.
+        Raises:
+            ValueError: If both time_budget and max_rollouts are None.
+        """
+        if time_budget is None and max_rollouts is None:
+            raise ValueError("MCTSBotPlayer needs a time_budget or "
+                             "max_rollouts.")
+        super().__init__(game_state, player_name, play_card_delay)
+        self.time_budget = time_budget
+        self.max_rollouts = max_rollouts
+        self.rollout_max_turns = rollout_max_turns
+        self.last_search = []
+        self._planned_color = None
+        self._rollout_director = None
+
+    def choose_card(self):
+        """
+        Search for the best move and play it.
+        """
+        moves = list_moves(self.hand, self.game.current_card())
+        if not moves:
+            return
+        if len(moves) == 1 or self.director is None:
+            move = moves[0]
+        else:
+            move = self.search(moves)
+
+        type_id, self._planned_color = move
+        for card in self.hand:
+            if card.type_id == type_id:
+                self.play_card(card)
+                break
+        self._planned_color = None
+
+    def choose_color(self, card, manual_input=None):
+        """
+        Choose the color of a Wild card: the one picked by the search, or a
+        random one if there wasn't a search.
+
+        Args:
+            card: A "Wild" colored Card instance whose color should be chosen.
+            manual_input: This is for testing the UserPlayerTextController
+                interface, and is not used here.
+        Returns:
+            A copy of the card with the player's choice as its chosen_color.
+        """
+        color = self._planned_color
+        if color is None:
+            color = self.game.rng.choice(COLORS[:4])
+        card = card.with_chosen_color(color)
+        self.publish(ColorChosen, card.color)
+        return card
+
+    def rollout_director(self):
+        """
+        Return the headless table of RolloutPlayers used for rollouts, creating
+        it if there isn't one with the right number of players yet.
+        """
+        num_players = len(self.director.players)
+        if (self._rollout_director is None or
+                len(self._rollout_director.players) != num_players):
+            self._rollout_director = make_rollout_director(
+                num_players, self.game.rng.getrandbits(64))
+        return self._rollout_director
+
+    def search(self, moves):
+        """
+        Play determinized rollouts of the current game until the budget runs
+        out, and return the move that was tried the most.
+
+        Every move is tried at least once, whatever the budget.
+
+        Args:
+            moves: A list of (type_id, color) tuples from list_moves().
+        Returns:
+            The chosen (type_id, color) tuple.
+        """
+        rollout_director = self.rollout_director()
+        wins, visits = run_search(
+            rollout_director, self.director.snapshot(),
+            self.director.players.index(self), moves,
+            rollout_director.game.rng, self.time_budget, self.max_rollouts,
+            self.rollout_max_turns, self.exploration)
+        return self.pick_move(moves, wins, visits)
+
+    def pick_move(self, moves, wins, visits):
+        """
+        Record the results of a search and return the move tried the most.
+
+        Args:
+            moves: A list of (type_id, color) tuples from list_moves().
+            wins: A list of the number of rollouts won after each move.
+            visits: A list of the number of rollouts played after each move.
+        Returns:
+            The chosen (type_id, color) tuple.
+        """
+        self.last_search = list(zip(moves, wins, visits))
+        best = max(range(len(moves)), key=visits.__getitem__)
+        return moves[best]
+
+
+# The rollout tables of a worker process, by number of players, so that each
+# task doesn't have to set up a new one
+worker_rollout_directors = {}
+
+
+def search_in_worker(root, seat, moves, seed, time_budget, max_rollouts,
+                     rollout_max_turns, exploration, first_moves):
+    """
+    Run a search in a worker process with its own random number stream, for
+    ParallelMCTSBotPlayer.
+
+    Args:
+        root: A TableSnapshot taken during the seated player's turn.
+        seat: An int representing the index of the player searching.
+        moves: A list of (type_id, color) tuples from list_moves().
+        seed: An int to seed this worker's random number generator with.
+        time_budget: A float representing the number of seconds to search for,
+            or None for no time limit.
+        max_rollouts: An int representing the number of rollouts to play, or
+            None for no limit.
+        rollout_max_turns: An int limiting the number of turns of each
+            rollout.
+        exploration: A float representing the UCB1 exploration constant.
+        first_moves: A list of the indices in moves of the moves this worker
+            should try once each before the budget applies.
+    Returns:
+        A tuple (wins, visits) of lists with the number of rollouts won and
+        played after each move.
+    """
+    num_players = len(root.hands)
+    if num_players not in worker_rollout_directors:
+        worker_rollout_directors[num_players] = make_rollout_director(
+            num_players)
+    director = worker_rollout_directors[num_players]
+    director.game.rng.seed(seed)
+    return run_search(director, root, seat, moves, director.game.rng,
+                      time_budget, max_rollouts, rollout_max_turns,
+                      exploration, first_moves)
+
+
+class ParallelMCTSBotPlayer(MCTSBotPlayer):
+    """
+    A bot player that chooses its cards with Monte Carlo search spread across
+    a pool of worker processes (root parallelization).
+
+    Every worker searches the same snapshot of the game with its own random
+    number stream, and the workers' win and visit counts for each move are
+    added together before choosing the move tried the most. The time budget
+    applies to every worker. The first rollouts, which try every move once,
+    are split between the workers, and so is the rest of the rollout budget,
+    so a search plays max_rollouts rollouts in all (or one per move, if that
+    is more).
+
+    Call close() (or use the bot as a context manager) when it is done
+    playing, to shut down the workers. They are also shut down when the bot
+    is garbage collected or the interpreter exits.
+
+    Attributes:
+        workers: An int representing the number of worker processes.
+        _executor: The ProcessPoolExecutor running the searches (created the
+            first time the bot searches), or None.
+        _shutdown: A weakref.finalize that shuts down the executor, or None.
+    """
+
+    def __init__(self, game_state, player_name, play_card_delay=None,
+                 time_budget=0.2, max_rollouts=None,
+                 rollout_max_turns=1000, workers=None):
+        """
+        Initialize a ParallelMCTSBotPlayer instance.
+
+        Args:
+            game_state: A GameState instance representing the uno game the
+                player is in.
+            player_name: A string representing the player's name.
+            play_card_delay: (optional) A float representing the number of
+                seconds the player should wait after playing their card.
+            time_budget: (optional) A float representing the number of seconds
+                to search per decision, default is 0.2. None means no time
+                limit.
+            max_rollouts: (optional) An int representing the total number of
+                rollouts to play per decision across all of the workers,
+                default is None for no limit.
+            rollout_max_turns: (optional) An int limiting the number of turns
+                of each rollout, default is 1000.
+            workers: (optional) An int representing the number of worker
+                processes to use, default is the number of CPUs.
+        """
+        super().__init__(game_state, player_name, play_card_delay,
+                         time_budget, max_rollouts, rollout_max_turns)
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+        self._shutdown = None
+
+    def search(self, moves):
+        """
+        Search the current game in every worker process at once, and return
+        the move that was tried the most across all of them.
+
+        Args:
+            moves: A list of (type_id, color) tuples from list_moves().
+        Returns:
+            The chosen (type_id, color) tuple.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            # The finalizer mustn't refer to the bot, or it would keep it alive
+            self._shutdown = weakref.finalize(self, self._executor.shutdown)
+        root = self.director.snapshot()
+        seat = self.director.players.index(self)
+
+        # Deal the moves out to the workers to try once each, then deal out
+        # whatever is left of the rollout budget
+        futures = []
+        extra_rollouts = None
+        if self.max_rollouts is not None:
+            extra_rollouts = max(0, self.max_rollouts - len(moves))
+        for worker in range(self.workers):
+            first_moves = list(range(worker, len(moves), self.workers))
+            max_rollouts = None
+            if extra_rollouts is not None:
+                max_rollouts = (len(first_moves) +
+                                extra_rollouts // self.workers +
+                                (worker < extra_rollouts % self.workers))
+                if max_rollouts == 0:
+                    continue
+            futures.append(self._executor.submit(
+                search_in_worker, root, seat, moves,
+                self.game.rng.getrandbits(64), self.time_budget, max_rollouts,
+                self.rollout_max_turns, self.exploration, first_moves))
+        wins = [0] * len(moves)
+        visits = [0] * len(moves)
+        for future in futures:
+            worker_wins, worker_visits = future.result()
+            for index, _ in enumerate(moves):
+                wins[index] += worker_wins[index]
+                visits[index] += worker_visits[index]
+        return self.pick_move(moves, wins, visits)
+
+    def close(self):
+        """
+        Shut down the worker processes, if they were started.
+        """
+        if self._executor is not None:
+            self._shutdown()
+            self._executor = None
+            self._shutdown = None
+
+    def __enter__(self):
+        """
+        Return the bot, so it can be used in a with statement that shuts down
+        its workers at the end.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Shut down the worker processes at the end of a with statement.
+        """
+        self.close()
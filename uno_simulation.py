@@ -0,0 +1,541 @@
+"""
+Functions for running headless (bot-only) uno games without a view.
+
+Run this file to play a batch of games from the command line, optionally under
+cProfile (--profile) or tracemalloc (--memory):
+
+    $ python uno_simulation.py --games 1000 --profile stacks.txt
+"""
+
+import argparse
+import cProfile
+import gc
+import os
+import pstats
+import random
+import tracemalloc
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from uno_deck import DECK_LAYOUT
+from uno_game import GameState, GameDirector
+from uno_controllers import BotPlayer
+
+
+# The outcome of a single headless game. winner is the index of the winning
+# player in the strategies list (None if the game hit max_turns first),
+# winner_name is their name, turns is the number of turns taken, reshuffles
+# is the number of times the discard pile was reused as the draw pile and seed
+# is the game's seed, which replays the game exactly when passed back to
+# simulate_game().
+GameResult = namedtuple("GameResult",
+                        ["winner", "winner_name", "turns", "reshuffles",
+                         "seed"])
+
+DEFAULT_STRATEGIES = (BotPlayer, BotPlayer, BotPlayer, BotPlayer)
+
+# The number of cards each player is dealt (see Player.__init__())
+HAND_SIZE = 7
+
+
+def decks_needed(num_players):
+    """
+    Return the smallest number of full decks that can deal every player in
+    and still turn over a first card.
+
+    Args:
+        num_players: An int representing the number of players at the table.
+    Returns:
+        An int.
+    """
+    return -(-(HAND_SIZE * num_players + 1) // len(DECK_LAYOUT))
+
+
+def setup_game(strategies, game_state=None):
+    """
+    Set up a headless game (with no event observers) with one undelayed player
+    per strategy.
+
+    Args:
+        strategies: A list of Player subclasses, one for each seat at the table
+            (in playing order).
+        game_state: (optional) A GameState instance to use, a new one is
+            created if this is not given.
+    Returns:
+        A GameDirector instance for the new game.
+    Raises:
+        ValueError: If the draw pile doesn't have enough cards to deal every
+            player in (see decks_needed()).
+    """
+    if game_state is None:
+        game_state = GameState(num_decks=decks_needed(len(strategies)))
+    if game_state.draw_pile.size() < HAND_SIZE * len(strategies):
+        raise ValueError(
+            f"A draw pile of {game_state.draw_pile.size()} cards can't deal "
+            f"{len(strategies)} players in, which takes "
+            f"{decks_needed(len(strategies))} decks.")
+    player_list = [strategy(game_state, f"{strategy.player_type} {index}",
+                            play_card_delay=0)
+                   for index, strategy in enumerate(strategies)]
+    return GameDirector(player_list, game_state)
+
+
+def run_game(director, max_turns=None, profiler=None):
+    """
+    Run the turn cycle of a game until a player wins, the same way
+    play_uno.main() does but without displaying anything.
+
+    Args:
+        director: A GameDirector instance for the game to run.
+        max_turns: (optional) An int limiting the number of turns to run
+            before giving up, or None (default) to run until someone wins.
+        profiler: (optional) A TurnProfiler or ChromeTracer (from
+            uno_profiling) to record each whole turn with as a "turn" phase,
+            or None (default).
+    Returns:
+        An int representing the number of turns taken.
+    """
+    game = director.game
+    turns = 0
+    while game.won is False:
+        if max_turns is not None and turns >= max_turns:
+            break
+        if profiler is not None:
+            start_ns = profiler.clock()
+        director.call_the_player()
+        turns += 1
+        if not game.won:
+            director.handle_reverse()
+            director.go_to_next_player()
+        if profiler is not None:
+            profiler.record("turn", start_ns, profiler.clock())
+    return turns
+
+
+def simulate_game(strategies=DEFAULT_STRATEGIES, max_turns=None, seed=None,
+                  num_decks=1, metrics=None, profiler=None):
+    """
+    Play one headless game and return its result.
+
+    Args:
+        strategies: (optional) A list of Player subclasses, one for each seat
+            at the table, default is four BotPlayers.
+        max_turns: (optional) An int limiting the number of turns to run
+            before giving up, or None (default) to run until someone wins.
+        seed: (optional) A seed for the game's random number generator, or
+            None (default) for an unpredictable game.
+        num_decks: (optional) An int representing the number of full decks in
+            the draw pile, default is 1. Large tables need more than one (see
+            decks_needed()).
+        metrics: (optional) A MetricsCollector (from uno_metrics) to add the
+            game's counters to, or None (default).
+        profiler: (optional) A TurnProfiler or ChromeTracer (from
+            uno_profiling) to time the game's turns with, or None (default).
+    Returns:
+        A GameResult for the game.
+    Raises:
+        ValueError: If num_decks is too few to deal every player in.
+    """
+    director = setup_game(strategies, GameState(seed=seed,
+                                                num_decks=num_decks))
+    if profiler is not None:
+        profiler.instrument_director(director)
+    turns = run_game(director, max_turns, profiler)
+    if profiler is not None:
+        profiler.remove()
+    if metrics is not None:
+        metrics.add_game(director)
+    return game_result(director, turns, seed)
+
+
+def game_result(director, turns, seed):
+    """
+    Return the result of a game that has been run.
+
+    Args:
+        director: The GameDirector of the game.
+        turns: An int representing the number of turns the game took.
+        seed: The seed the game was played with.
+    Returns:
+        A GameResult for the game.
+    """
+    if director.game.won:
+        winner = director.current_player_index
+        winner_name = director.current_player().name
+    else:
+        winner = None
+        winner_name = None
+    return GameResult(winner, winner_name, turns, director.game.reshuffles,
+                      seed)
+
+
+def simulate_games(n, strategies=DEFAULT_STRATEGIES, seed=None,
+                   max_turns=None, num_decks=1, metrics=None, profiler=None):
+    """
+    Play a number of headless games and return their results.
+
+    Args:
+        n: An int representing the number of games to play.
+        strategies: (optional) A list of Player subclasses, one for each seat
+            at the table, default is four BotPlayers.
+        seed: (optional) A seed for the stream of per-game seeds so that the
+            games can be reproduced, or None (default) for random games.
+        max_turns: (optional) An int limiting the number of turns of each game
+            before giving up on it, or None (default) to play until someone
+            wins.
+        num_decks: (optional) An int representing the number of full decks in
+            each game's draw pile, default is 1.
+        metrics: (optional) A MetricsCollector (from uno_metrics) to add every
+            game's counters to as it ends, and to flush once they are all
+            done, or None (default).
+        profiler: (optional) A TurnProfiler or ChromeTracer (from
+            uno_profiling) to time every game's turns with, or None (default).
+    Returns:
+        A list of n GameResults, in the order the games were played.
+    Raises:
+        ValueError: If num_decks is too few to deal every player in.
+    """
+    seed_stream = random.Random(seed)
+    results = [simulate_game(strategies, max_turns,
+                             seed_stream.getrandbits(64), num_decks, metrics,
+                             profiler)
+               for _ in range(n)]
+    if metrics is not None:
+        metrics.flush()
+    return results
+
+
+def play_chunk(chunk_seed, num_games, strategies=DEFAULT_STRATEGIES,
+               max_turns=None, num_decks=1):
+    """
+    Play a chunk of headless games from a single seed and return compact
+    results, so that a worker process doesn't have to send back whole
+    GameResults or GameStates.
+
+    Args:
+        chunk_seed: An int to seed the chunk's stream of per-game seeds with.
+        num_games: An int representing the number of games to play.
+        strategies: (optional) A list of Player subclasses, one for each seat
+            at the table, default is four BotPlayers.
+        max_turns: (optional) An int limiting the number of turns of each game,
+            or None (default) to play until someone wins.
+        num_decks: (optional) An int representing the number of full decks in
+            each game's draw pile, default is 1.
+    Returns:
+        A list of (winner, turns, reshuffles, seed) tuples, one for each game.
+    """
+    return [(result.winner, result.turns, result.reshuffles, result.seed)
+            for result in simulate_games(num_games, strategies, chunk_seed,
+                                         max_turns, num_decks)]
+
+
+def run_tournament(n, strategies=DEFAULT_STRATEGIES, seed=None, workers=None,
+                   chunk_size=1000, max_turns=None, num_decks=1):
+    """
+    Play a number of headless games spread across a pool of worker processes.
+
+    The games are split into chunks of chunk_size games, and every chunk gets
+    its own seed drawn from a generator seeded with seed. The results only
+    depend on seed and chunk_size, not on the number of workers.
+
+    Args:
+        n: An int representing the number of games to play.
+        strategies: (optional) A list of Player subclasses, one for each seat
+            at the table, default is four BotPlayers. They must be picklable
+            (defined at the top level of a module).
+        seed: (optional) A seed for the tournament so that it can be
+            reproduced, or None (default) for a random tournament.
+        workers: (optional) An int representing the number of worker processes
+            to use, default is the number of CPUs. If this is 1, the games are
+            played in this process.
+        chunk_size: (optional) An int representing the number of games each
+            worker plays per task, default is 1000.
+        max_turns: (optional) An int limiting the number of turns of each game,
+            or None (default) to play until someone wins.
+        num_decks: (optional) An int representing the number of full decks in
+            each game's draw pile, default is 1.
+    Returns:
+        A list of n (winner, turns, reshuffles, seed) tuples, in chunk order.
+    """
+    # Give every chunk its own seed from a stream seeded by the tournament
+    seed_stream = random.Random(seed)
+    chunk_games = [min(chunk_size, n - start)
+                   for start in range(0, n, chunk_size)]
+    chunk_seeds = [seed_stream.getrandbits(64) for _ in chunk_games]
+    task_args = (chunk_seeds, chunk_games, [strategies] * len(chunk_games),
+                 [max_turns] * len(chunk_games),
+                 [num_decks] * len(chunk_games))
+
+    results = []
+    if workers == 1:
+        for chunk_results in map(play_chunk, *task_args):
+            results.extend(chunk_results)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_results in executor.map(play_chunk, *task_args):
+            results.extend(chunk_results)
+    return results
+
+
+def tally_wins(results, num_players):
+    """
+    Count the number of games each player won.
+
+    Args:
+        results: A list of GameResults or (winner, turns, reshuffles, seed)
+            tuples.
+        num_players: An int representing the number of players in each game.
+    Returns:
+        A list of ints where index i is the number of games player i won.
+    """
+    wins = [0] * num_players
+    for result in results:
+        if result[0] is not None:
+            wins[result[0]] += 1
+    return wins
+
+
+def function_label(func):
+    """
+    Return a readable label for a function in pstats statistics, without the
+    semicolons that separate frames in collapsed stacks.
+
+    Args:
+        func: A (filename, line number, function name) tuple from pstats.
+    Returns:
+        A string like "draw (uno_deck.py:387)".
+    """
+    filename, line_number, name = func
+    if filename == "~":
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line_number})"
+    return label.replace(";", ",")
+
+
+def collapsed_stacks(stats, min_microseconds=1):
+    """
+    Turn cProfile statistics into collapsed stacks, the input format of
+    flamegraph tools (e.g. flamegraph.pl or speedscope).
+
+    cProfile only records which function called which, so the time of a
+    function called from several places is split between their stacks in
+    proportion to the time spent on each call edge.
+
+    Args:
+        stats: A pstats.Stats instance.
+        min_microseconds: (optional) An int representing the least self time a
+            stack needs to be included, default is 1.
+    Returns:
+        A list of strings like "outer;inner 42", with each stack's self time
+        in microseconds.
+    """
+    callees = {func: [] for func in stats.stats}
+    roots = []
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            if caller in callees:
+                callees[caller].append((func, edge[3]))
+
+    totals = {}
+
+    def visit(func, stack, share):
+        """
+        Add the self time of func along this stack, then visit its callees
+        with the share of their time that came from this stack.
+        """
+        self_time = stats.stats[func][2]
+        stack = stack + [function_label(func)]
+        key = ";".join(stack)
+        totals[key] = totals.get(key, 0) + self_time * share * 1e6
+        for callee, edge_time in callees[func]:
+            callee_time = stats.stats[callee][3]
+            if callee_time <= 0 or callee in visited:
+                continue
+            callee_share = share * edge_time / callee_time
+            if callee_time * callee_share * 1e6 >= min_microseconds:
+                visited.add(callee)
+                visit(callee, stack, min(callee_share, 1.0))
+                visited.discard(callee)
+
+    for root in roots:
+        visited = {root}
+        visit(root, [], 1.0)
+    return [f"{stack} {round(microseconds)}"
+            for stack, microseconds in totals.items()
+            if microseconds >= min_microseconds]
+
+
+def profile_games(n, path, strategies=DEFAULT_STRATEGIES, seed=None,
+                  max_turns=None, num_decks=1):
+    """
+    Play a number of headless games under cProfile and write the profile as
+    collapsed stacks for a flamegraph.
+
+    Args:
+        n: An int representing the number of games to play.
+        path: A string representing the file to write the stacks to.
+        strategies: (optional) A list of Player subclasses, one for each seat
+            at the table, default is four BotPlayers.
+        seed: (optional) A seed for the games, or None (default).
+        max_turns: (optional) An int limiting the number of turns of each game,
+            or None (default) to play until someone wins.
+        num_decks: (optional) An int representing the number of full decks in
+            each game's draw pile, default is 1.
+    Returns:
+        A list of n GameResults.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    results = simulate_games(n, strategies, seed, max_turns, num_decks)
+    profiler.disable()
+    with open(path, "w", encoding="utf-8") as file:
+        for line in collapsed_stacks(pstats.Stats(profiler)):
+            file.write(line + "\n")
+    return results
+
+
+def trace_memory(n, every, top=10, strategies=DEFAULT_STRATEGIES, seed=None,
+                 max_turns=None, num_decks=1):
+    """
+    Play a number of headless games under tracemalloc, and report the top
+    allocation sites every few games.
+
+    Each report's snapshot is taken when a game has ended but its table (the
+    decks, cards and hands) is still in memory, after collecting garbage, so
+    it shows both where a game's memory comes from and anything kept between
+    games.
+
+    Args:
+        n: An int representing the number of games to play.
+        every: An int representing the number of games between reports.
+        top: (optional) An int representing the number of allocation sites to
+            report each time, default is 10.
+        strategies: (optional) A list of Player subclasses, one for each seat
+            at the table, default is four BotPlayers.
+        seed: (optional) A seed for the games (the same games simulate_games()
+            plays with it), or None (default).
+        max_turns: (optional) An int limiting the number of turns of each game,
+            or None (default) to play until someone wins.
+        num_decks: (optional) An int representing the number of full decks in
+            each game's draw pile, default is 1.
+    Returns:
+        A tuple of the list of n GameResults and a list of (games played, peak
+        bytes traced since the last report, list of tracemalloc.StatisticDiff)
+        tuples, one for each report, with the top sites by memory allocated
+        and how much that changed since the last report.
+    """
+    ignored = [tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    seed_stream = random.Random(seed)
+    results = []
+    reports = []
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        # Collect the reference cycles between finished games' players and
+        # directors first, so the reports only show memory that is kept
+        gc.collect()
+        previous = tracemalloc.take_snapshot().filter_traces(ignored)
+        tracemalloc.reset_peak()
+        for game_num in range(1, n + 1):
+            game_seed = seed_stream.getrandbits(64)
+            director = setup_game(strategies, GameState(seed=game_seed,
+                                                        num_decks=num_decks))
+            results.append(game_result(director, run_game(director, max_turns),
+                                       game_seed))
+            if game_num % every == 0 or game_num == n:
+                gc.collect()
+                snapshot = tracemalloc.take_snapshot().filter_traces(ignored)
+                reports.append((game_num, tracemalloc.get_traced_memory()[1],
+                                snapshot.compare_to(previous,
+                                                    "lineno")[:top]))
+                previous = snapshot
+                tracemalloc.reset_peak()
+            del director
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return results, reports
+
+
+def positive_int(text):
+    """
+    Parse a command line argument that must be a whole number of at least 1.
+
+    Args:
+        text: A string from the command line.
+    Returns:
+        An int.
+    Raises:
+        argparse.ArgumentTypeError: If the text isn't an int of at least 1.
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {text!r}")
+    return value
+
+
+def main(args=None):
+    """
+    Play a batch of headless games from the command line and print a summary,
+    optionally profiling them.
+
+    Args:
+        args: (optional) A list of argument strings, or None (default) to use
+            sys.argv.
+    """
+    parser = argparse.ArgumentParser(
+        description="Play headless bot-only uno games.")
+    parser.add_argument("--games", type=positive_int, default=1000)
+    parser.add_argument("--players", type=positive_int, default=4)
+    parser.add_argument("--decks", type=positive_int,
+                        help="number of full decks in the draw pile (default: "
+                        "the fewest that can deal every player in)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--max-turns", type=int)
+    parser.add_argument("--profile", metavar="PATH",
+                        help="run the games under cProfile and write collapsed "
+                        "stacks for a flamegraph to PATH")
+    parser.add_argument("--memory", type=positive_int, metavar="K",
+                        help="trace memory allocations and report the top "
+                        "allocation sites every K games")
+    parser.add_argument("--top", type=positive_int, default=10,
+                        help="number of allocation sites per memory report")
+    options = parser.parse_args(args)
+    if options.decks is None:
+        options.decks = decks_needed(options.players)
+    elif options.decks < decks_needed(options.players):
+        parser.error(f"{options.players} players need at least "
+                     f"{decks_needed(options.players)} decks")
+
+    strategies = [BotPlayer] * options.players
+    settings = {"strategies": strategies, "seed": options.seed,
+                "max_turns": options.max_turns, "num_decks": options.decks}
+    if options.profile is not None:
+        results = profile_games(options.games, options.profile, **settings)
+        print(f"Wrote collapsed stacks to {options.profile}")
+    elif options.memory is not None:
+        results, reports = trace_memory(options.games, options.memory,
+                                        options.top, **settings)
+        for games_played, peak, statistics in reports:
+            print(f"Top allocation sites after {games_played} games (peak "
+                  f"{peak / 1024:.1f} KiB):")
+            for statistic in statistics:
+                print(f"  {statistic}")
+    else:
+        results = simulate_games(options.games, **settings)
+
+    turns = sum(result.turns for result in results)
+    print(f"{len(results)} games, {turns / len(results):.1f} turns per game, "
+          f"wins by seat: {tally_wins(results, options.players)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+A NumPy engine that plays many bot-only uno games at once.
+
+This module needs NumPy, which the rest of the game doesn't. It follows the
+same rules as GameState, GameDirector and Player.take_turn (including the
+first non-special start card and reusing the discard pile when the draw pile
+runs low), but holds every game's piles and hands as arrays of card type ids
+from uno_deck.CARD_TYPES and moves all of the games forward one turn per step.
+"""
+
+import numpy as np
+from uno_deck import CARD_TYPES, DECK_LAYOUT, PLAYABLE_MASKS
+
+
+# Codes for the action a game is waiting to handle
+NO_ACTION, SKIP, DRAW_TWO, DRAW_FOUR, REVERSE = range(5)
+
+# Lookup tables indexed by card type id
+TYPE_COLORS = np.array([card_type.color_index for card_type in CARD_TYPES],
+                       dtype=np.int8)
+TYPE_SPECIAL = np.array([card_type.special for card_type in CARD_TYPES])
+TYPE_WILD = np.array([card_type.wild for card_type in CARD_TYPES])
+TYPE_ACTIONS = np.array(
+    [{"Skip": SKIP, "+2": DRAW_TWO, "+4": DRAW_FOUR,
+      "Reverse": REVERSE}.get(card_type.symbol, NO_ACTION)
+     for card_type in CARD_TYPES], dtype=np.int8)
+
+# PLAYABLE[top_type_id, color_index] is a bool array over the card types that
+# can be played on that current card, unpacked from uno_deck.PLAYABLE_MASKS
+PLAYABLE = np.array([[[bool(mask >> card_type.type_id & 1)
+                       for card_type in CARD_TYPES]
+                      for mask in color_masks]
+                     for color_masks in PLAYABLE_MASKS])
+
+
+class VectorGames:
+    """
+    A batch of bot-only uno games played in lockstep.
+
+    Every bot plays the playable card with the lowest type id (the earliest in
+    CARD_TYPES), since hands are kept as counts and have no order, and chooses
+    a random color for Wild cards.
+
+    The piles are stacks with the top card at index size - 1.
+
+    Attributes:
+        num_games: An int representing the number of games in the batch.
+        num_players: An int representing the number of players in each game.
+        rng: A numpy.random.Generator that all of the games' randomness comes
+            from.
+        draw_pile: An int8 array (games x cards) of card type ids.
+        draw_size: An int array with the number of cards in each draw pile.
+        discard_pile: An int8 array (games x cards) of card type ids.
+        discard_size: An int array with the number of cards in each discard
+            pile.
+        top_color: An int8 array with the color index of each game's current
+            card (the chosen color if it is Wild).
+        hands: An int16 array (games x players x card types) with the number
+            of cards of each type in each player's hand.
+        hand_sizes: An int16 array (games x players) with the number of cards
+            in each player's hand.
+        current: An int array with the index of each game's current player.
+        direction: An int8 array with each game's direction of play (1 or -1).
+        pending: An int8 array with the action code each game's current player
+            has to handle.
+        won: A bool array that is True for the games that have been won.
+        winner: An int array with the index of each game's winner (-1 until
+            someone wins).
+        turns: An int array with the number of turns taken in each game.
+        reshuffles: An int array with the number of times each game has reused
+            its discard pile as the draw pile.
+    """
+
+    def __init__(self, num_games, num_players=4, seed=None, num_decks=1):
+        """
+        Shuffle, set up the discard piles and deal every game in the batch.
+
+        Args:
+            num_games: An int representing the number of games to play.
+            num_players: (optional) An int representing the number of players
+                in each game, default is 4.
+            seed: (optional) A seed for the batch's random number generator,
+                or None (default) for unpredictable games.
+            num_decks: (optional) An int representing the number of full decks
+                in each draw pile, default is 1.
+        """
+        self.num_games = num_games
+        self.num_players = num_players
+        self.rng = np.random.default_rng(seed)
+        rows = np.arange(num_games)
+
+        # Shuffle a full deck for every game
+        layout = np.tile(np.array(DECK_LAYOUT, dtype=np.int8), num_decks)
+        capacity = layout.size
+        cards = self.rng.permuted(np.tile(layout, (num_games, 1)), axis=1)
+
+        # Find the first non-special card from the top of each deck to start
+        # the discard pile. If there were special cards above it, they go back
+        # in the deck and the deck is shuffled again.
+        depth = np.argmax(~TYPE_SPECIAL[cards[:, ::-1]], axis=1)
+        start_position = capacity - 1 - depth
+        start_cards = cards[rows, start_position]
+        cards = cards[np.arange(capacity) != start_position[:, None]].reshape(
+            num_games, capacity - 1)
+        moved = depth > 0
+        cards[moved] = self.rng.permuted(cards[moved], axis=1)
+
+        self.draw_pile = np.zeros((num_games, capacity), dtype=np.int8)
+        self.draw_pile[:, :capacity - 1] = cards
+        self.draw_size = np.full(num_games, capacity - 1)
+        self.discard_pile = np.zeros((num_games, capacity), dtype=np.int8)
+        self.discard_pile[:, 0] = start_cards
+        self.discard_size = np.ones(num_games, dtype=np.int64)
+        self.top_color = TYPE_COLORS[start_cards]
+
+        self.current = np.zeros(num_games, dtype=np.int64)
+        self.direction = np.ones(num_games, dtype=np.int8)
+        self.pending = np.full(num_games, NO_ACTION, dtype=np.int8)
+        self.won = np.zeros(num_games, dtype=bool)
+        self.winner = np.full(num_games, -1)
+        self.turns = np.zeros(num_games, dtype=np.int64)
+        self.reshuffles = np.zeros(num_games, dtype=np.int64)
+
+        # Deal 7 cards to each player in turn
+        self.hands = np.zeros((num_games, num_players, len(CARD_TYPES)),
+                              dtype=np.int16)
+        self.hand_sizes = np.zeros((num_games, num_players), dtype=np.int16)
+        sevens = np.full(num_games, 7)
+        for player in range(num_players):
+            self._draw(rows, np.full(num_games, player), sevens)
+
+    def _draw(self, rows, players, num_cards):
+        """
+        Have one player in each of the given games draw cards, reusing the
+        discard pile first if the draw pile has fewer than 5 cards (like
+        GameState.draw).
+
+        Args:
+            rows: An int array of distinct game indices.
+            players: An int array with the index of the player drawing in each
+                game.
+            num_cards: An int array with the number of cards to draw in each
+                game.
+        """
+        for game in rows[self.draw_size[rows] < 5]:
+            self._reuse_discard_pile(game)
+        for card_num in range(int(num_cards.max(initial=0))):
+            drawing = (card_num < num_cards) & (self.draw_size[rows] > 0)
+            draw_rows = rows[drawing]
+            draw_players = players[drawing]
+            self.draw_size[draw_rows] -= 1
+            cards = self.draw_pile[draw_rows, self.draw_size[draw_rows]]
+            self.hands[draw_rows, draw_players, cards] += 1
+            self.hand_sizes[draw_rows, draw_players] += 1
+
+    def _reuse_discard_pile(self, game):
+        """
+        Add one game's shuffled discard pile (except the current card) to the
+        bottom of its draw pile, like GameState.reuse_discard_pile.
+
+        Args:
+            game: An int representing the index of the game.
+        """
+        self.reshuffles[game] += 1
+        num_reused = self.discard_size[game] - 1
+        if num_reused == 0:
+            return
+        size = self.draw_size[game]
+        pile = self.draw_pile[game]
+        pile[num_reused:num_reused + size] = pile[:size].copy()
+        pile[:num_reused] = self.rng.permutation(
+            self.discard_pile[game, :num_reused])
+        self.draw_size[game] = size + num_reused
+        self.discard_pile[game, 0] = self.discard_pile[game, num_reused]
+        self.discard_size[game] = 1
+
+    def step(self):
+        """
+        Have the current player of every unfinished game take their turn, then
+        handle reverses and move on to the next player.
+        """
+        rows = np.flatnonzero(~self.won)
+        if rows.size == 0:
+            return
+        self.turns[rows] += 1
+        players = self.current[rows]
+        pending = self.pending[rows]
+
+        # Handle outstanding actions: "Skip", "+2" and "+4" all end the turn
+        acting = pending != NO_ACTION
+        draw_counts = np.where(pending == DRAW_TWO, 2,
+                               np.where(pending == DRAW_FOUR, 4, 0))
+        drawing = draw_counts > 0
+        self._draw(rows[drawing], players[drawing], draw_counts[drawing])
+        self.pending[rows[acting]] = NO_ACTION
+
+        # Find the players who can play a card
+        rows = rows[~acting]
+        players = players[~acting]
+        top_cards = self.discard_pile[rows, self.discard_size[rows] - 1]
+        playable = ((self.hands[rows, players] > 0) &
+                    PLAYABLE[top_cards, self.top_color[rows]])
+        can_play = playable.any(axis=1)
+
+        # Players who can't play draw 1 card and end their turn
+        self._draw(rows[~can_play], players[~can_play],
+                   np.ones(np.count_nonzero(~can_play), dtype=np.int64))
+
+        # Everyone else plays their first playable card
+        rows = rows[can_play]
+        players = players[can_play]
+        cards = playable[can_play].argmax(axis=1).astype(np.int8)
+        self.hands[rows, players, cards] -= 1
+        self.hand_sizes[rows, players] -= 1
+        self.discard_pile[rows, self.discard_size[rows]] = cards
+        self.discard_size[rows] += 1
+        colors = TYPE_COLORS[cards]
+        wild = TYPE_WILD[cards]
+        colors[wild] = self.rng.integers(0, 4, np.count_nonzero(wild))
+        self.top_color[rows] = colors
+
+        # Flag the winners
+        winning = self.hand_sizes[rows, players] == 0
+        self.won[rows[winning]] = True
+        self.winner[rows[winning]] = players[winning]
+
+        # Reverses are handled right away, other actions wait for the next
+        # player
+        actions = TYPE_ACTIONS[cards]
+        reversing = actions == REVERSE
+        self.direction[rows[reversing]] *= -1
+        self.pending[rows] = np.where(reversing, NO_ACTION, actions)
+
+        # Move on to the next player in the unfinished games
+        rows = np.flatnonzero(~self.won)
+        self.current[rows] = ((self.current[rows] + self.direction[rows])
+                              % self.num_players)
+
+    def run(self, max_turns=None):
+        """
+        Step every game until they have all been won.
+
+        Args:
+            max_turns: (optional) An int limiting the number of turns to run
+                before giving up on the unfinished games, or None (default) to
+                run until every game is won.
+        Returns:
+            The VectorGames instance, for chaining.
+        """
+        steps = 0
+        while not self.won.all():
+            if max_turns is not None and steps >= max_turns:
+                break
+            self.step()
+            steps += 1
+        return self
+
+    def results(self):
+        """
+        Return the result of each game.
+
+        Returns:
+            A list of (winner, turns, reshuffles) tuples, one for each game,
+            with winner None for games that weren't won.
+        """
+        return [(None if winner < 0 else winner, turns, reshuffles)
+                for winner, turns, reshuffles
+                in zip(self.winner.tolist(), self.turns.tolist(),
+                       self.reshuffles.tolist())]
+
+
+def simulate_vector_games(n, num_players=4, seed=None, max_turns=None,
+                          batch_size=10000):
+    """
+    Play a number of bot-only games in batches of lockstep games.
+
+    Args:
+        n: An int representing the number of games to play.
+        num_players: (optional) An int representing the number of players in
+            each game, default is 4.
+        seed: (optional) A seed for the stream of batch seeds, or None
+            (default) for unpredictable games.
+        max_turns: (optional) An int limiting the number of turns of each game,
+            or None (default) to play until someone wins.
+        batch_size: (optional) An int representing the number of games to
+            hold in memory at once, default is 10000.
+    Returns:
+        A list of n (winner, turns, reshuffles) tuples.
+    """
+    seed_stream = np.random.SeedSequence(seed)
+    results = []
+    for start in range(0, n, batch_size):
+        games = VectorGames(min(batch_size, n - start), num_players,
+                            seed_stream.spawn(1)[0])
+        results.extend(games.run(max_turns).results())
+    return results
@@ -3,35 +3,70 @@ Classes representing viewing modes for the uno game.
 """
 
 from abc import ABC, abstractmethod
+from collections import deque
 from uno_color_text_view_helpers import (
-    put_in_card,
-    get_big_card,
-    color_card_rep,
-    print_cards,
-    other_players_as_big_card
+    small_card_sprite,
+    big_card_sprite,
+    card_rows,
+    other_players_as_big_card,
+    pad_big_card,
+    ring_layout,
+    fill_ring
 )
+from uno_renderers import StreamRenderer
+from uno_events import (
+    CardPlayed,
+    CardsDrawn,
+    PlayerSkipped,
+    ColorChosen,
+    GameWon
+)
+
+
+# The number of terminal columns each hand card takes up
+CARD_WIDTH = 6
 
 
 class UnoView(ABC):
     """
     An abstract class for viewing the uno game.
 
+    Each turn's output is assembled as a frame (a list of rows) by the
+    *_rows methods, and handed to a renderer that writes it to the terminal
+    with a single write, so slow terminals don't show it arriving line by
+    line.
+
     Attributes:
         players: A list of Player instances (either users or bots).
         game: A GameState instance representing the parts of the game that
             players can interact with.
+        renderer: A renderer from uno_renderers that writes the frames.
+        event_log: An EventLog whose messages are shown in each frame, or
+            None.
     """
 
-    def __init__(self, player_list, game_state):
+    def __init__(self, player_list, game_state, renderer=None,
+                 event_log=None):
         """
         Initialize a new game view instance.
 
         Args:
             players_list: A list of Player instances (either users or bots).
             game_state: A GameState instance for the new game.
+            renderer: (optional) A renderer from uno_renderers, e.g. a
+                DiffRenderer for full-screen play, or None (default) for a
+                StreamRenderer that prints each frame below the last.
+            event_log: (optional) An EventLog subscribed to the game's events
+                whose latest messages should be shown in each frame (e.g. for
+                full-screen play, where anything printed below the frame is
+                cleared by the next one), or None (default).
         """
         self.players = player_list
         self.game = game_state
+        if renderer is None:
+            renderer = StreamRenderer()
+        self.renderer = renderer
+        self.event_log = event_log
 
     def display(self, current_player, show_bot_hands=False):
         """
@@ -43,36 +78,89 @@ class UnoView(ABC):
                 of the bots playing (for testing) or False (default) to only
                 show the hand of the user, as the game is meant to be played.
         """
-        print("============================================================")
-        self.display_other_players_and_current_card()
-        print(f"It's {current_player.name}'s turn.")
+        self.write(self.frame_rows(current_player, show_bot_hands))
+
+    def frame_rows(self, current_player, show_bot_hands=False):
+        """
+        Return the rows of everything displayed for this turn.
+
+        Args:
+            current_player: The Player instance whose turn it currently is.
+            show_bot_hands: A bool that tells whether or not to include the
+                hands of the bots playing (for testing) or False (default) to
+                only include the hand of the user.
+        Returns:
+            A list of strings.
+        """
+        rows = ["============================================================"]
+        rows += self.other_players_and_current_card_rows()
+        if self.event_log is not None:
+            rows += self.event_log.rows()
+        rows.append(f"It's {current_player.name}'s turn.")
         if ((show_bot_hands is True or current_player.player_type == "User")
                 and self.game.current_action is None):
-            self.display_hand(current_player)
+            rows += self.hand_rows(current_player)
+        return rows
+
+    def write(self, rows):
+        """
+        Write rows to the terminal as one frame, using the view's renderer.
+
+        Args:
+            rows: A list of strings, each written on its own line.
+        """
+        self.renderer.render(rows)
 
-    @abstractmethod
     def display_other_players_and_current_card(self):
         """
-        An abstract method for showing the other players and their card count,
-        as well as the current top card.
+        Show the other players and their card count, as well as the current
+        top card.
         """
+        self.write(self.other_players_and_current_card_rows())
 
-    @abstractmethod
     def display_other_players(self):
         """
-        An abstract method for showing the other players and their card count.
+        Show the other players and their card count.
         """
+        self.write(self.other_players_rows())
 
-    @abstractmethod
     def display_current_card(self):
         """
-        An abstract method for showing the current top card.
+        Show the current top card.
         """
+        self.write(self.current_card_rows())
 
-    @abstractmethod
     def display_hand(self, player):
         """
-        An abstract method for showing the current player's hand.
+        Show the current player's hand.
+        """
+        self.write(self.hand_rows(player))
+
+    @abstractmethod
+    def other_players_and_current_card_rows(self):
+        """
+        An abstract method returning the rows showing the other players and
+        their card count, as well as the current top card.
+        """
+
+    @abstractmethod
+    def other_players_rows(self):
+        """
+        An abstract method returning the rows showing the other players and
+        their card count.
+        """
+
+    @abstractmethod
+    def current_card_rows(self):
+        """
+        An abstract method returning the rows showing the current top card.
+        """
+
+    @abstractmethod
+    def hand_rows(self, player):
+        """
+        An abstract method returning the rows showing the current player's
+        hand.
         """
 
     def __repr__(self):
@@ -90,34 +178,33 @@ class TextView(UnoView):
     information as plain text on the command line.
     """
 
-    def display_other_players(self):
+    def other_players_rows(self):
         """
-        Print the names of the other players and the number of cards they have.
+        Return the names of the other players and the number of cards they
+        have.
         """
-        for player in self.players:
-            print(f"{player.name} has {player.num_cards()} cards.")
+        return [f"{player.name} has {player.num_cards()} cards."
+                for player in self.players]
 
-    def display_current_card(self):
+    def current_card_rows(self):
         """
-        Print the current card as plain text.
+        Return the current card as plain text.
         """
-        print(f"The current card is {self.game.current_color()} "
-            f"{self.game.current_symbol()}.")
+        return [f"The current card is {self.game.current_color()} "
+                f"{self.game.current_symbol()}."]
 
-    def display_hand(self, player):
+    def hand_rows(self, player):
         """
-        Print the player's hand as plain text.
+        Return the player's hand as plain text.
         """
-        print(f"{player.name}'s hand:")
-        print(player.hand)
+        return [f"{player.name}'s hand:", str(player.hand)]
 
-    def display_other_players_and_current_card(self):
+    def other_players_and_current_card_rows(self):
         """
-        Print the names of the other players and the number of cards they have
+        Return the names of the other players and the number of cards they have
         as well as the current card.
         """
-        self.display_other_players()
-        self.display_current_card()
+        return self.other_players_rows() + self.current_card_rows()
 
 
 class ColorTextView(UnoView):
@@ -126,67 +213,65 @@ class ColorTextView(UnoView):
     information as plain text and colorful ascii art in the terminal.
     """
 
-    def display_other_players(self):
+    def other_players_rows(self):
         """
-        Print to the terminal the other players and the number of cards they
-        have as an ascii art diamond with arrows indicating the direction of
-        play.
+        Return the other players and the number of cards they have as an ascii
+        art ring with arrows indicating the direction of play.
         """
-        full = self.make_other_players_diamond()
-        for line in full:
-            print(line)
+        return self.make_other_players_ring()
 
-    def display_current_card(self):
+    def current_card_rows(self):
         """
-        Print to the terminal a colored ascii art representation of the current
-        card.
+        Return a colored ascii art representation of the current card.
         """
-        print(f"The current card is {self.game.current_color()} "
-            f"{self.game.current_symbol()}.")
-        card_rep = get_big_card(self.game.current_symbol())
-        card_rep = color_card_rep(card_rep, self.game.current_color())
-        print_cards([card_rep])
+        card_rep = big_card_sprite(self.game.current_symbol(),
+                                   self.game.current_color())
+        return [f"The current card is {self.game.current_color()} "
+                f"{self.game.current_symbol()}."] + card_rows([card_rep])
 
-    def display_other_players_and_current_card(self):
+    def other_players_and_current_card_rows(self):
         """
-        Print to the terminal a colored ascii art representation of the current
-        card and the other players and the number of cards they have as an
-        ascii art diamond in one block.
+        Return a colored ascii art representation of the current card and the
+        other players and the number of cards they have as an ascii art
+        ring in one block.
         """
-        print(f"The current card is {self.game.current_color()} "
-            f"{self.game.current_symbol()}.")
-        card_rep = get_big_card(self.game.current_symbol())
-        card_rep = color_card_rep(card_rep, self.game.current_color())
-        players_rep = self.make_other_players_diamond()
+        card_rep = big_card_sprite(self.game.current_symbol(),
+                                   self.game.current_color())
+        players_rep = self.make_other_players_ring()
         players_big_card = other_players_as_big_card(players_rep)
-        print_cards([card_rep, players_big_card])
+        if len(players_big_card) > len(card_rep):
+            card_rep = pad_big_card(card_rep, len(players_big_card))
+        return [f"The current card is {self.game.current_color()} "
+                f"{self.game.current_symbol()}."] + card_rows(
+                    [card_rep, players_big_card])
 
-    def display_hand(self, player):
+    def hand_rows(self, player):
         """
-        Print to the terminal a colored ascii art representation of the cards
-        in the player's hand.
-        """
-        print(f"{player.name}'s hand:")
-        card_reps = []
-        for card in player.hand:
-            card_rep = put_in_card(card.symbol)
-            card_rep = color_card_rep(card_rep, card.color)
-            card_reps.append(card_rep)
+        Return a colored ascii art representation of the cards in the player's
+        hand, with the index of each card below it.
 
-        index_str = ""
-        for i in range(1, len(player.hand)+1):
-            index_str += str(i).center(6)
+        The cards are split over as many rows of cards as it takes for none of
+        the rows to be wider than the terminal.
+        """
+        card_reps = [small_card_sprite(card.symbol, card.color)
+                     for card in player.hand]
+        cards_per_row = max(1, self.renderer.columns() // CARD_WIDTH)
 
-        print_cards(card_reps)
-        print(index_str)
+        rows = [f"{player.name}'s hand:"]
+        for start in range(0, len(card_reps), cards_per_row):
+            row_reps = card_reps[start:start + cards_per_row]
+            rows += card_rows(row_reps)
+            rows.append("".join(str(i).center(CARD_WIDTH) for i in
+                                range(start + 1, start + len(row_reps) + 1)))
+        return rows
 
-    def make_other_players_diamond(self):
+    def make_other_players_ring(self):
         """
         Make a list of rows that when printed, shows the other players and the
-        number of cards they have as an ascii art diamond with arrows
-        indicating the direction of play.
+        number of cards they have as an ascii art ring with arrows indicating
+        the direction of play.
 
-        When printed, the result is like this:
+        When printed with 4 players, the result is a diamond like this:
 
                   Bot 2
                    (6)
@@ -197,56 +282,106 @@ class ColorTextView(UnoView):
                   Bot 0
                    (4)
 
+        The layout of the names and arrows is built once per set of player
+        names (see ring_layout), so each turn only fills in the card counts.
+
         Returns:
             A list of strings.
         """
-        # Define the unicode arrows and diamond width
-        ne_arrow = "\u2197"
-        se_arrow = "\u2198"
-        sw_arrow = "\u2199"
-        nw_arrow = "\u2196"
-        half_width = 8
-
-        # Create a list of string representations for the number of cards each
-        # player has in their hand (formatted in parentheses)
-        card_count_strings = []
-        for player in self.players:
-            card_str = "(" + str(player.num_cards()) + ")"
-            card_str = card_str.center(len(player.name))
-            card_count_strings.append(card_str)
-
-        # Create centered blocks of two rows with the player names and card
-        # counts with the first player on the bottom, and the second to the left
-        top = [self.players[2].name.center(half_width*2 + 1),
-               card_count_strings[2].center(half_width*2 + 1)]
-        bottom = [self.players[0].name.center(half_width*2 + 1),
-                  card_count_strings[0].center(half_width*2 + 1)]
-        left = [self.players[1].name.ljust(half_width),
-                card_count_strings[1].ljust(half_width)]
-        right = [self.players[3].name.rjust(half_width),
-                 card_count_strings[3].rjust(half_width)]
-
-        # Create the arrow rows to point clockwise for forward, and
-        # counterclockwise for backwards
-        if self.game.direction == 1:
-            arrows = [ne_arrow.center(half_width) + " " +
-                        se_arrow.center(half_width),
-                      nw_arrow.center(half_width) + " " +
-                        sw_arrow.center(half_width)]
-        else:
-            arrows = [sw_arrow.center(half_width) + " " +
-                        nw_arrow.center(half_width),
-                      se_arrow.center(half_width) + " " +
-                        ne_arrow.center(half_width)]
-
-        # Assemble all of the blocks
-        full = [top[0],
-                top[1],
-                arrows[0],
-                left[0] + " " + right[0],
-                left[1] + " " + right[1],
-                arrows[1],
-                bottom[0],
-                bottom[1]]
-        # Return the assembled string list
-        return full
+        layout = ring_layout(tuple(player.name for player in self.players))
+        return fill_ring(layout, [player.num_cards()
+                                  for player in self.players],
+                         self.game.direction)
+
+
+class ConsoleEventObserver:
+    """
+    An observer for a game's EventBus that prints what happens during each
+    turn as plain text on the command line.
+    """
+
+    def __call__(self, event):
+        """
+        Print a message describing an event.
+
+        Args:
+            event: One of the event namedtuples from uno_events.
+        """
+        print(self.describe(event))
+
+    @staticmethod
+    def describe(event):
+        """
+        Return a message describing an event.
+
+        Args:
+            event: One of the event namedtuples from uno_events.
+        Returns:
+            A string describing the event.
+        """
+        name = event.player.name
+        if isinstance(event, CardPlayed):
+            return f"{name} played {event.card}."
+        if isinstance(event, CardsDrawn):
+            if event.reason is None:
+                return f"No play possible - {name} draws " \
+                    f"{event.num_cards} card."
+            return f"{name} drew {event.num_cards} cards and misses their turn."
+        if isinstance(event, PlayerSkipped):
+            return f"{name} was skipped."
+        if isinstance(event, ColorChosen):
+            return f"{name} chose {event.color}."
+        if isinstance(event, GameWon):
+            return f"{name} won!"
+        return f"{name}: {event}"
+
+    def __repr__(self):
+        """
+        Return the observer's class name, overwriting the default
+        representation of ConsoleEventObserver.
+        """
+        return f"{self.__class__.__name__}"
+
+
+class EventLog:
+    """
+    An observer for a game's EventBus that keeps the messages describing the
+    latest events, so a view can show them inside its frame.
+
+    Attributes:
+        lines: A deque of the latest messages, oldest first.
+    """
+
+    def __init__(self, max_lines=3):
+        """
+        Initialize an empty log.
+
+        Args:
+            max_lines: (optional) An int representing the number of messages
+                to keep, default is 3.
+        """
+        self.lines = deque(maxlen=max_lines)
+
+    def __call__(self, event):
+        """
+        Add the message describing an event, dropping the oldest message if
+        the log is full.
+
+        Args:
+            event: One of the event namedtuples from uno_events.
+        """
+        self.lines.append(ConsoleEventObserver.describe(event))
+
+    def rows(self):
+        """
+        Return the messages as rows for a frame, padded with empty rows to
+        max_lines so the rows below them stay in place.
+        """
+        return list(self.lines) + [""] * (self.lines.maxlen - len(self.lines))
+
+    def __repr__(self):
+        """
+        Return the messages in the log, overwriting the default representation
+        of EventLog.
+        """
+        return f"{self.__class__.__name__} with lines: {list(self.lines)}"